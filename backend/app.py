@@ -48,7 +48,7 @@ from lead_registry import (  # noqa: E402
     update_queue_status,
     get_queue_items,
     get_queue_summary,
-    get_people_for_campaign,
+    iter_people_for_campaign,
     calculate_enrichment_hash,
     recent_request_hash,
     log_outreach,
@@ -1263,13 +1263,14 @@ def apollo_search():
         "rejected": 0
     }
 
+    scoring_now = datetime.now(timezone.utc)
     for person in people:
         person_record, company_record = parse_apollo_search_person(person)
         company_key = upsert_company(company_record)
         person_record["company_key"] = company_key
         person_record["company_domain"] = company_record.get("domain", "")
 
-        features = extract_features(person_record, company_record)
+        features = extract_features(person_record, company_record, scoring_now)
         icp_match, icp_score, _ = score_icp(features)
         readiness_score = compute_automation_readiness(features)
         strategy_assignment = assign_strategy(icp_match, readiness_score)
@@ -1397,6 +1398,7 @@ def apollo_queue_process():
         key = (item.get("reveal_personal_emails", 0), item.get("reveal_phone_number", 0))
         grouped.setdefault(key, []).append(item)
 
+    scoring_now = datetime.now(timezone.utc)
     for (reveal_personal, reveal_phone), group_items in grouped.items():
         for i in range(0, len(group_items), Config.APOLLO_BULK_MATCH_SIZE):
             batch = group_items[i:i + Config.APOLLO_BULK_MATCH_SIZE]
@@ -1535,7 +1537,7 @@ def apollo_queue_process():
                 person_payload["enriched_at"] = utc_now()
                 person_payload["enrichment_request_hash"] = queue_item.get("request_hash", "")
 
-                features = extract_features(person_payload, company_payload)
+                features = extract_features(person_payload, company_payload, scoring_now)
                 icp_match, icp_score, _ = score_icp(features)
                 readiness_score = compute_automation_readiness(features)
                 strategy_assignment = assign_strategy(icp_match, readiness_score)
@@ -1569,30 +1571,28 @@ def campaign_apollo_export(campaign_id: str):
     if not campaign:
         return jsonify({"error": "Campaign not found"}), 404
 
-    leads = get_people_for_campaign(campaign_id)
-    if not leads:
-        return jsonify({"error": "No enriched leads available for export"}), 400
-
     rows = []
-    for lead in leads:
-        full_name = " ".join([lead.get("first_name", ""), lead.get("last_name", "")]).strip()
+    for lead in iter_people_for_campaign(campaign_id):
+        full_name = " ".join([lead["first_name"] or "", lead["last_name"] or ""]).strip()
         rows.append(
             {
-                "Company": lead.get("company_name", ""),
-                "Industry": lead.get("company_industry", ""),
-                "Email address": lead.get("email", ""),
+                "Company": lead["company_name"],
+                "Industry": lead["company_industry"],
+                "Email address": lead["email"],
                 "Full name": full_name,
-                "Job title": lead.get("title", ""),
-                "ICP Match": lead.get("icp_match", ""),
+                "Job title": lead["title"],
+                "ICP Match": lead["icp_match"],
                 "Notes": "",
-                "Equipment": lead.get("equipment_signals", ""),
-                "strategy_assignment": lead.get("strategy_assignment", ""),
-                "employee_count": lead.get("employee_count", 0),
-                "technologies": lead.get("technologies", ""),
-                "wms_system": lead.get("wms_system", ""),
-                "job_postings_relevant": lead.get("job_postings_relevant", 0)
+                "Equipment": lead["equipment_signals"],
+                "strategy_assignment": lead["strategy_assignment"],
+                "employee_count": lead["employee_count"],
+                "technologies": lead["technologies"],
+                "wms_system": lead["wms_system"],
+                "job_postings_relevant": lead["job_postings_relevant"]
             }
         )
+    if not rows:
+        return jsonify({"error": "No enriched leads available for export"}), 400
 
     df = pd.DataFrame(rows)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -3874,8 +3874,14 @@ def leadfeeder_manual_sync():
     # Get optional parameters from request
     days_back = request.json.get("days_back", 7) if request.json else 7
     account_id = request.json.get("account_id") if request.json else None
-
-    result = sync_leadfeeder_data(days_back=days_back, account_id=account_id)
+    account_ids = request.json.get("account_ids") if request.json else None
+    if account_ids is not None and not (
+        isinstance(account_ids, list)
+        and all(isinstance(acc_id, str) and acc_id.strip() for acc_id in account_ids)
+    ):
+        return jsonify({"error": "account_ids must be a list of non-empty strings"}), 400
+
+    result = sync_leadfeeder_data(days_back=days_back, account_id=account_id, account_ids=account_ids)
     return jsonify(result)
 
 
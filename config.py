@@ -51,6 +51,10 @@ class Config:
     LEADFEEDER_EMAIL = os.getenv("LEADFEEDER_EMAIL")  # Legacy: For web scraping fallback
     LEADFEEDER_PASSWORD = os.getenv("LEADFEEDER_PASSWORD")  # Legacy: For web scraping fallback
     LEADFEEDER_SCRAPE_DAY = 5  # Days before data expires (Leadfeeder free = 7 days)
+    LEADFEEDER_AUTH_STATE_PATH = BASE_DIR / "data" / "leadfeeder_auth_state.json"  # Legacy scraper session cookies
+    LEADFEEDER_AUTH_STATE_MAX_AGE_HOURS = 72  # Ignore saved sessions older than this
+    LEADFEEDER_DEBUG_SCREENSHOTS = os.getenv("LEADFEEDER_DEBUG_SCREENSHOTS", "false").lower() == "true"  # Legacy scraper debug captures
+    LEADFEEDER_DEBUG_FILE_LIMIT = 20  # Newest debug captures kept on disk
 
     # Visitor Tracking Configuration
     VISITOR_RATE_LIMIT_PER_HOUR = 100  # Max visits per IP per hour
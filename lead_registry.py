@@ -1,6 +1,9 @@
 import hashlib
 import logging
 import sqlite3
+import sys
+from contextlib import closing
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -13,10 +16,75 @@ BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = BASE_DIR / "data" / "leads.db"
 
 
+# Column order for leads_company / leads_people upserts. The upsert SQL below is
+# generated from these tuples so the INSERT list, VALUES list and ON CONFLICT
+# clause can't drift apart. Upsert statements are kept as module constants so
+# every call passes the identical string and hits the prepared-statement cache.
+_COMPANY_COLS = (
+    "company_key", "apollo_org_id", "domain_norm", "name", "industry", "employee_count",
+    "estimated_revenue", "technologies", "tech_stack_hash", "wms_system", "equipment_signals",
+    "job_postings_count", "job_postings_relevant", "locations", "enriched_at", "created_at", "updated_at"
+)
+
+_PERSON_COLS = (
+    "person_key", "apollo_person_id", "linkedin_url_norm", "email_norm", "company_key",
+    "first_name", "last_name", "title", "seniority", "department", "email", "email_status",
+    "phone", "job_start_date", "icp_match", "icp_score", "strategy_assignment", "readiness_score",
+    "source", "enriched_at", "created_at", "updated_at", "enrichment_request_hash"
+)
+
+# Scores only ever move up on conflict.
+_PERSON_MAX_COLS = ("icp_score", "readiness_score")
+
+
+def _person_conflict_clause(col: str) -> str:
+    if col in _PERSON_MAX_COLS:
+        return f"{col}=MAX(leads_people.{col}, excluded.{col})"
+    if col == "updated_at":
+        return f"{col}=excluded.{col}"
+    return f"{col}=COALESCE(excluded.{col}, leads_people.{col})"
+
+
+def _company_conflict_clause(col: str) -> str:
+    if col == "enriched_at":
+        return f"{col}=COALESCE(excluded.{col}, leads_company.{col})"
+    return f"{col}=excluded.{col}"
+
+
+def _build_upsert_sql(table: str, key: str, cols: tuple, conflict_clause) -> str:
+    return (
+        f"INSERT INTO {table} ({', '.join(cols)}) "
+        f"VALUES ({', '.join(':' + col for col in cols)}) "
+        f"ON CONFLICT({key}) DO UPDATE SET "
+        + ", ".join(conflict_clause(col) for col in cols if col not in (key, "created_at"))
+    )
+
+
+_UPSERT_COMPANY_SQL = _build_upsert_sql("leads_company", "company_key", _COMPANY_COLS, _company_conflict_clause)
+_UPSERT_PERSON_SQL = _build_upsert_sql("leads_people", "person_key", _PERSON_COLS, _person_conflict_clause)
+
+
+@lru_cache(maxsize=64)
+def _partial_person_upsert_sql(cols: tuple) -> str:
+    return _build_upsert_sql("leads_people", "person_key", cols, _person_conflict_clause)
+
+
 def utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def sql_value(value):
+    """
+    Return value unchanged if sqlite3 can bind it as a column value.
+
+    Raises TypeError for anything else (dicts, lists, ...), so callers batching
+    rows for executemany can reject a single record instead of failing the batch.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError(f"cannot store {type(value).__name__} value {value!r:.50} in a column")
+
+
 def parse_timestamp(timestamp: str):
     if not timestamp:
         return None
@@ -28,13 +96,27 @@ def parse_timestamp(timestamp: str):
 
 def get_connection():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    # With WAL (set in init_db) NORMAL is still crash-safe and commits skip the
+    # per-transaction fsync; on a rollback journal it would not be, so keep FULL.
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+        conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def get_read_connection():
+    """Autocommit connection for pure SELECTs so reads never open a transaction."""
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=256)
     conn.row_factory = sqlite3.Row
     return conn
 
 
 def init_db():
     with get_connection() as conn:
+        # Persistent on the database file; lets readers run alongside writers.
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS leads_company (
@@ -90,6 +172,17 @@ def init_db():
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_leads_people_company_key ON leads_people(company_key)"
         )
+        # Normalized keys are lowercased at write; NOCASE indexes keep lookups on them
+        # case-insensitive without wrapping the column in lower() or falling back to LIKE.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_leads_people_email_norm_nc ON leads_people(email_norm COLLATE NOCASE)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_leads_people_linkedin_norm_nc ON leads_people(linkedin_url_norm COLLATE NOCASE)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_leads_company_domain_norm_nc ON leads_company(domain_norm COLLATE NOCASE)"
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS outreach_log (
@@ -105,6 +198,9 @@ def init_db():
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_outreach_person ON outreach_log(person_key)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outreach_person_sent ON outreach_log(person_key, sent_at)"
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS apollo_queue (
@@ -125,6 +221,9 @@ def init_db():
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_apollo_queue_status ON apollo_queue(status)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_apollo_queue_request ON apollo_queue(person_key, request_hash, updated_at)"
+        )
 
 
 def upgrade_schema_v2():
@@ -457,7 +556,8 @@ def upgrade_schema_v3():
 
 
 def normalize_email(email: str) -> str:
-    return normalize_text(email)
+    # Interned: the same address recurs across imports and is used as a dict/set key.
+    return sys.intern(normalize_text(email))
 
 
 def normalize_domain(domain: str) -> str:
@@ -470,7 +570,8 @@ def normalize_domain(domain: str) -> str:
     domain = domain.split("/")[0]
     if domain.startswith("www."):
         domain = domain[4:]
-    return domain
+    # Interned: many leads share one company domain.
+    return sys.intern(domain)
 
 
 def normalize_linkedin(url: str) -> str:
@@ -486,9 +587,9 @@ def normalize_linkedin(url: str) -> str:
 
 def compute_company_key(apollo_org_id: str, domain_norm: str, name: str = "", hq_city: str = "", hq_state: str = "") -> str:
     if apollo_org_id:
-        return f"apollo_org:{apollo_org_id}"
+        return sys.intern(f"apollo_org:{apollo_org_id}")
     if domain_norm:
-        return f"domain:{domain_norm}"
+        return sys.intern(f"domain:{domain_norm}")
     fallback = f"{normalize_text(name)}|{normalize_text(hq_city)}|{normalize_text(hq_state)}"
     return f"hash:{stable_hash(fallback)}"
 
@@ -503,11 +604,11 @@ def compute_person_key(
     title: str
 ) -> str:
     if apollo_person_id:
-        return f"apollo_person:{apollo_person_id}"
+        return sys.intern(f"apollo_person:{apollo_person_id}")
     if linkedin_url_norm:
-        return f"linkedin:{linkedin_url_norm}"
+        return sys.intern(f"linkedin:{linkedin_url_norm}")
     if email_norm:
-        return f"email:{email_norm}"
+        return sys.intern(f"email:{email_norm}")
     fallback = "|".join(
         [
             normalize_text(first_name),
@@ -546,36 +647,7 @@ def upsert_company(company: dict) -> str:
     }
 
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO leads_company (
-                company_key, apollo_org_id, domain_norm, name, industry, employee_count,
-                estimated_revenue, technologies, tech_stack_hash, wms_system, equipment_signals,
-                job_postings_count, job_postings_relevant, locations, enriched_at, created_at, updated_at
-            ) VALUES (
-                :company_key, :apollo_org_id, :domain_norm, :name, :industry, :employee_count,
-                :estimated_revenue, :technologies, :tech_stack_hash, :wms_system, :equipment_signals,
-                :job_postings_count, :job_postings_relevant, :locations, :enriched_at, :created_at, :updated_at
-            )
-            ON CONFLICT(company_key) DO UPDATE SET
-                apollo_org_id=excluded.apollo_org_id,
-                domain_norm=excluded.domain_norm,
-                name=excluded.name,
-                industry=excluded.industry,
-                employee_count=excluded.employee_count,
-                estimated_revenue=excluded.estimated_revenue,
-                technologies=excluded.technologies,
-                tech_stack_hash=excluded.tech_stack_hash,
-                wms_system=excluded.wms_system,
-                equipment_signals=excluded.equipment_signals,
-                job_postings_count=excluded.job_postings_count,
-                job_postings_relevant=excluded.job_postings_relevant,
-                locations=excluded.locations,
-                enriched_at=COALESCE(excluded.enriched_at, leads_company.enriched_at),
-                updated_at=excluded.updated_at
-            """,
-            values
-        )
+        conn.execute(_UPSERT_COMPANY_SQL, values)
     return company_key
 
 
@@ -621,51 +693,60 @@ def upsert_person(person: dict) -> str:
     }
 
     with get_connection() as conn:
-        conn.execute(
+        conn.execute(_UPSERT_PERSON_SQL, values)
+    return person_key
+
+
+def upsert_person_partial(person_key: str, **fields) -> str:
+    """Upsert only the given leads_people columns for ``person_key``.
+
+    For small updates such as refreshing email_status, where building and
+    binding the full upsert_person payload is wasted work. Unset columns keep
+    their stored values; the statement is cached per distinct column set.
+    """
+    unknown = set(fields) - set(_PERSON_COLS)
+    if unknown:
+        raise ValueError(f"Unknown leads_people columns: {', '.join(sorted(unknown))}")
+    now = utc_now()
+    values = {"person_key": person_key, "created_at": now, "updated_at": now}
+    values.update(fields)
+    cols = tuple(col for col in _PERSON_COLS if col in values)
+    with get_connection() as conn:
+        conn.execute(_partial_person_upsert_sql(cols), values)
+    return person_key
+
+
+def bump_person_scores(rows: list[tuple[str, int, int]]) -> None:
+    """Raise icp_score/readiness_score for existing people in one transaction.
+
+    Each row is ``(person_key, icp_score, readiness_score)``. Scores only ever
+    move up, matching the MAX() rule in upsert_person. Use this when a caller
+    has re-scored people without new enrichment data; full enrichment writes
+    still go through upsert_person.
+    """
+    if not rows:
+        return
+    now = utc_now()
+    with get_connection() as conn:
+        conn.executemany(
             """
-            INSERT INTO leads_people (
-                person_key, apollo_person_id, linkedin_url_norm, email_norm, company_key,
-                first_name, last_name, title, seniority, department, email, email_status,
-                phone, job_start_date, icp_match, icp_score, strategy_assignment, readiness_score,
-                source, enriched_at, created_at, updated_at, enrichment_request_hash
-            ) VALUES (
-                :person_key, :apollo_person_id, :linkedin_url_norm, :email_norm, :company_key,
-                :first_name, :last_name, :title, :seniority, :department, :email, :email_status,
-                :phone, :job_start_date, :icp_match, :icp_score, :strategy_assignment, :readiness_score,
-                :source, :enriched_at, :created_at, :updated_at, :enrichment_request_hash
-            )
-            ON CONFLICT(person_key) DO UPDATE SET
-                apollo_person_id=COALESCE(excluded.apollo_person_id, leads_people.apollo_person_id),
-                linkedin_url_norm=COALESCE(excluded.linkedin_url_norm, leads_people.linkedin_url_norm),
-                email_norm=COALESCE(excluded.email_norm, leads_people.email_norm),
-                company_key=COALESCE(excluded.company_key, leads_people.company_key),
-                first_name=COALESCE(excluded.first_name, leads_people.first_name),
-                last_name=COALESCE(excluded.last_name, leads_people.last_name),
-                title=COALESCE(excluded.title, leads_people.title),
-                seniority=COALESCE(excluded.seniority, leads_people.seniority),
-                department=COALESCE(excluded.department, leads_people.department),
-                email=COALESCE(excluded.email, leads_people.email),
-                email_status=COALESCE(excluded.email_status, leads_people.email_status),
-                phone=COALESCE(excluded.phone, leads_people.phone),
-                job_start_date=COALESCE(excluded.job_start_date, leads_people.job_start_date),
-                icp_match=COALESCE(excluded.icp_match, leads_people.icp_match),
-                icp_score=MAX(leads_people.icp_score, excluded.icp_score),
-                strategy_assignment=COALESCE(excluded.strategy_assignment, leads_people.strategy_assignment),
-                readiness_score=MAX(leads_people.readiness_score, excluded.readiness_score),
-                source=COALESCE(excluded.source, leads_people.source),
-                enriched_at=COALESCE(excluded.enriched_at, leads_people.enriched_at),
-                updated_at=excluded.updated_at,
-                enrichment_request_hash=COALESCE(excluded.enrichment_request_hash, leads_people.enrichment_request_hash)
+            UPDATE leads_people
+            SET icp_score = MAX(COALESCE(icp_score, 0), ?),
+                readiness_score = MAX(COALESCE(readiness_score, 0), ?),
+                updated_at = ?
+            WHERE person_key = ?
             """,
-            values
+            [
+                (int(icp_score or 0), int(readiness_score or 0), now, person_key)
+                for person_key, icp_score, readiness_score in rows
+            ]
         )
-    return person_key
 
 
 def get_person_by_key(person_key: str):
     if not person_key:
         return None
-    with get_connection() as conn:
+    with closing(get_read_connection()) as conn:
         row = conn.execute(
             "SELECT * FROM leads_people WHERE person_key = ?", (person_key,)
         ).fetchone()
@@ -676,9 +757,9 @@ def get_person_by_email(email: str):
     email_norm = normalize_email(email)
     if not email_norm:
         return None
-    with get_connection() as conn:
+    with closing(get_read_connection()) as conn:
         row = conn.execute(
-            "SELECT * FROM leads_people WHERE email_norm = ?", (email_norm,)
+            "SELECT * FROM leads_people WHERE email_norm = ? COLLATE NOCASE", (email_norm,)
         ).fetchone()
     return dict(row) if row else None
 
@@ -686,7 +767,7 @@ def get_person_by_email(email: str):
 def get_company_by_key(company_key: str):
     if not company_key:
         return None
-    with get_connection() as conn:
+    with closing(get_read_connection()) as conn:
         row = conn.execute(
             "SELECT * FROM leads_company WHERE company_key = ?", (company_key,)
         ).fetchone()
@@ -696,18 +777,14 @@ def get_company_by_key(company_key: str):
 def is_suppressed(person_key: str) -> bool:
     if not person_key:
         return False
-    suppression_window = datetime.now(timezone.utc) - timedelta(days=Config.APOLLO_SUPPRESSION_DAYS)
-    with get_connection() as conn:
+    # utc_now() writes fixed-offset ISO-8601, so timestamps compare correctly as strings.
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=Config.APOLLO_SUPPRESSION_DAYS)).isoformat()
+    with closing(get_read_connection()) as conn:
         row = conn.execute(
-            "SELECT sent_at FROM outreach_log WHERE person_key = ? ORDER BY sent_at DESC LIMIT 1",
-            (person_key,)
+            "SELECT 1 FROM outreach_log WHERE person_key = ? AND sent_at >= ? LIMIT 1",
+            (person_key, cutoff)
         ).fetchone()
-    if not row:
-        return False
-    last_sent = parse_timestamp(row["sent_at"])
-    if not last_sent:
-        return False
-    return last_sent >= suppression_window
+    return row is not None
 
 
 def log_outreach(person_key: str, campaign_id: str, sequence_step: int, status: str):
@@ -727,7 +804,7 @@ def insert_queue_record(person_key: str, campaign_id: str, status: str, request_
                         reveal_personal_emails: bool, reveal_phone_number: bool, note: str = "") -> int:
     now = utc_now()
     with get_connection() as conn:
-        conn.execute(
+        cursor = conn.execute(
             """
             INSERT INTO apollo_queue (
                 person_key, campaign_id, status, request_hash,
@@ -747,8 +824,7 @@ def insert_queue_record(person_key: str, campaign_id: str, status: str, request_
                 ""
             )
         )
-        row = conn.execute("SELECT last_insert_rowid() as id").fetchone()
-    return int(row["id"]) if row else 0
+    return int(cursor.lastrowid or 0)
 
 
 def enqueue_enrichment(person_key: str, campaign_id: str, request_hash: str,
@@ -777,7 +853,7 @@ def update_queue_status(queue_id: int, status: str, error: str = ""):
 
 
 def get_queue_items(status: str = "queued", limit: int = 10) -> list[dict]:
-    with get_connection() as conn:
+    with closing(get_read_connection()) as conn:
         rows = conn.execute(
             "SELECT * FROM apollo_queue WHERE status = ? ORDER BY created_at ASC LIMIT ?",
             (status, limit)
@@ -786,26 +862,21 @@ def get_queue_items(status: str = "queued", limit: int = 10) -> list[dict]:
 
 
 def recent_request_hash(person_key: str, request_hash: str, ttl_days: int) -> bool:
-    cutoff = datetime.now(timezone.utc) - timedelta(days=ttl_days)
-    with get_connection() as conn:
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=ttl_days)).isoformat()
+    with closing(get_read_connection()) as conn:
         row = conn.execute(
             """
-            SELECT updated_at FROM apollo_queue
-            WHERE person_key = ? AND request_hash = ?
-            ORDER BY updated_at DESC LIMIT 1
+            SELECT 1 FROM apollo_queue
+            WHERE person_key = ? AND request_hash = ? AND updated_at >= ?
+            LIMIT 1
             """,
-            (person_key, request_hash)
+            (person_key, request_hash, cutoff)
         ).fetchone()
-    if not row:
-        return False
-    updated_at = parse_timestamp(row["updated_at"])
-    if not updated_at:
-        return False
-    return updated_at >= cutoff
+    return row is not None
 
 
 def get_queue_summary(campaign_id: str = "") -> dict:
-    with get_connection() as conn:
+    with closing(get_read_connection()) as conn:
         params = ()
         where = ""
         if campaign_id:
@@ -819,9 +890,14 @@ def get_queue_summary(campaign_id: str = "") -> dict:
     return summary
 
 
-def get_people_for_campaign(campaign_id: str) -> list[dict]:
-    with get_connection() as conn:
-        rows = conn.execute(
+def iter_people_for_campaign(campaign_id: str):
+    """Stream a campaign's enriched people as sqlite3.Row objects.
+
+    Rows are yielded straight off the cursor, so large exports never hold the
+    whole result set or a dict copy of each row in memory.
+    """
+    with closing(get_read_connection()) as conn:
+        yield from conn.execute(
             """
             SELECT p.*, c.name as company_name, c.industry as company_industry,
                    c.employee_count as employee_count, c.technologies as technologies,
@@ -834,8 +910,11 @@ def get_people_for_campaign(campaign_id: str) -> list[dict]:
             ORDER BY q.updated_at ASC
             """,
             (campaign_id,)
-        ).fetchall()
-    return [dict(row) for row in rows]
+        )
+
+
+def get_people_for_campaign(campaign_id: str) -> list[dict]:
+    return [dict(row) for row in iter_people_for_campaign(campaign_id)]
 
 
 def calculate_enrichment_hash(person_key: str, reveal_personal_emails: bool, reveal_phone_number: bool) -> str:
@@ -1054,6 +1133,7 @@ def upgrade_schema_v6():
         """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_visitor_companies_domain ON visitor_companies(domain)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_visitor_companies_last_visit ON visitor_companies(last_visit_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_visitor_companies_name ON visitor_companies(company_name)")
 
         # Visit sessions (aggregated visits per company)
         conn.execute("""
@@ -1,8 +1,17 @@
 import hashlib
+import re
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
-LOGISTICS_KEYWORDS = [
+
+LOGISTICS_KEYWORDS = (
     "3pl",
     "logistics",
     "distribution",
@@ -10,9 +19,9 @@ LOGISTICS_KEYWORDS = [
     "supply chain",
     "third party",
     "fulfillment"
-]
+)
 
-COLD_STORAGE_KEYWORDS = [
+COLD_STORAGE_KEYWORDS = (
     "cold",
     "frozen",
     "food",
@@ -20,52 +29,52 @@ COLD_STORAGE_KEYWORDS = [
     "dairy",
     "meat",
     "produce"
-]
+)
 
-MANUFACTURING_KEYWORDS = [
+MANUFACTURING_KEYWORDS = (
     "manufactur",
     "industrial",
     "plant"
-]
+)
 
-ECOMMERCE_KEYWORDS = [
+ECOMMERCE_KEYWORDS = (
     "e-commerce",
     "ecommerce",
     "retail",
     "online"
-]
+)
 
-OPS_TITLE_KEYWORDS = [
+OPS_TITLE_KEYWORDS = (
     "operations",
     "warehouse",
     "logistics",
     "supply chain",
     "distribution"
-]
+)
 
-QA_TITLE_KEYWORDS = [
+QA_TITLE_KEYWORDS = (
     "quality",
     "qa",
     "food safety",
     "compliance"
-]
+)
 
-CONTROLS_KEYWORDS = [
+CONTROLS_KEYWORDS = (
     "controls",
     "automation",
     "systems",
     "robotics"
-]
+)
 
-ERP_KEYWORDS = [
+ERP_KEYWORDS = (
     "sap",
     "oracle",
     "netsuite",
     "infor",
     "epicor"
-]
+)
 
-WMS_KEYWORDS = [
+WMS_KEYWORDS = (
     "manhattan",
     "blue yonder",
     "jda",
@@ -74,16 +83,111 @@ WMS_KEYWORDS = [
     "infor",
     "highjump",
     "wms"
-]
+)
+
+ENTERPRISE_WMS_KEYWORDS = (
+    "manhattan",
+    "blue yonder",
+    "jda",
+    "sap",
+    "oracle"
+)
+
+AUTOMATION_SIGNAL_SET = frozenset({"automation", "asrs", "agv_amr", "sortation", "shuttle"})
+
+C_SUITE_TITLE_KEYWORDS = ("chief", "ceo", "coo", "cfo", "president")
+VP_DIRECTOR_TITLE_KEYWORDS = ("vp", "vice president", "director", "head")
+MANAGER_TITLE_KEYWORDS = ("manager", "supervisor", "lead")
+ENGINEER_TITLE_KEYWORDS = ("engineer", "engineering", "systems", "automation", "controls")
+
+# Exact-token lookups tried before the substring scan; a hit here implies a substring hit
+WMS_KEYWORDS_SET = frozenset(WMS_KEYWORDS)
+ENTERPRISE_WMS_KEYWORDS_SET = frozenset(ENTERPRISE_WMS_KEYWORDS)
+ERP_KEYWORDS_SET = frozenset(ERP_KEYWORDS)
+
+
+class KeywordMatcher:
+    """Keyword list compiled once so a text is scanned in a single pass.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed and falls
+    back to a precompiled regex alternation of the keywords otherwise.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        # Alternation of the same keywords; also used by pandas .str.contains in batch scoring.
+        self.regex = re.compile("|".join(map(re.escape, self.keywords)))
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def search(self, text: str) -> bool:
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        return self.regex.search(text) is not None
+
+
+LOGISTICS_MATCHER = KeywordMatcher(LOGISTICS_KEYWORDS)
+COLD_STORAGE_MATCHER = KeywordMatcher(COLD_STORAGE_KEYWORDS)
+MANUFACTURING_MATCHER = KeywordMatcher(MANUFACTURING_KEYWORDS)
+ECOMMERCE_MATCHER = KeywordMatcher(ECOMMERCE_KEYWORDS)
+OPS_TITLE_MATCHER = KeywordMatcher(OPS_TITLE_KEYWORDS)
+QA_TITLE_MATCHER = KeywordMatcher(QA_TITLE_KEYWORDS)
+ERP_MATCHER = KeywordMatcher(ERP_KEYWORDS)
+WMS_MATCHER = KeywordMatcher(WMS_KEYWORDS)
+ENTERPRISE_WMS_MATCHER = KeywordMatcher(ENTERPRISE_WMS_KEYWORDS)
+C_SUITE_TITLE_MATCHER = KeywordMatcher(C_SUITE_TITLE_KEYWORDS)
+VP_DIRECTOR_TITLE_MATCHER = KeywordMatcher(VP_DIRECTOR_TITLE_KEYWORDS)
+MANAGER_TITLE_MATCHER = KeywordMatcher(MANAGER_TITLE_KEYWORDS)
+ENGINEER_TITLE_MATCHER = KeywordMatcher(ENGINEER_TITLE_KEYWORDS)
+
+# One pass over the industry string tags every ICP industry category it mentions.
+# The alternation sits inside a zero-width lookahead so finditer tries every
+# position, and overlapping keywords from different categories are still found
+# (no keyword in one category is a prefix of a keyword in another).
+INDUSTRY_CATEGORY_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in (
+            ("logistics", LOGISTICS_KEYWORDS),
+            ("cold_storage", COLD_STORAGE_KEYWORDS),
+            ("manufacturing", MANUFACTURING_KEYWORDS),
+            ("ecommerce", ECOMMERCE_KEYWORDS),
+        )
+    ) + ")"
+)
+
+
+# Industries, titles and departments repeat heavily across leads, so the string
+# helpers below are memoized on their (hashable) string inputs.
+@lru_cache(maxsize=8192)
+def _normalize_str(value: str) -> str:
+    return value.strip().lower()
 
 
 def normalize_text(value: str) -> str:
     if value is None:
         return ""
+    if isinstance(value, str):
+        return _normalize_str(value)
     return str(value).strip().lower()
 
 
+@lru_cache(maxsize=8192)
+def _parse_employee_count_str(value: str) -> int:
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
 def parse_employee_count(value) -> int:
+    if isinstance(value, str):
+        return _parse_employee_count_str(value)
     try:
         return int(float(value))
     except (TypeError, ValueError):
@@ -98,67 +202,114 @@ def ensure_list(value) -> list:
     return [item.strip() for item in str(value).split(",") if item.strip()]
 
 
-def contains_any(text: str, keywords: list[str]) -> bool:
+def contains_any(text: str, keywords: tuple[str, ...]) -> bool:
     return any(keyword in text for keyword in keywords)
 
 
+@lru_cache(maxsize=4096)
+def classify_industry(industry: str) -> frozenset:
+    """Return the ICP industry categories (logistics, cold_storage, ...) named in ``industry``."""
+    return frozenset(match.lastgroup for match in INDUSTRY_CATEGORY_RE.finditer(industry))
+
+
 def title_bucket(title: str) -> str:
-    text = normalize_text(title)
-    if any(keyword in text for keyword in ["chief", "ceo", "coo", "cfo", "president"]):
+    return _title_bucket(normalize_text(title))
+
+
+@lru_cache(maxsize=8192)
+def _title_bucket(text: str) -> str:
+    if C_SUITE_TITLE_MATCHER.search(text):
         return "c_suite"
-    if any(keyword in text for keyword in ["vp", "vice president", "director", "head"]):
+    if VP_DIRECTOR_TITLE_MATCHER.search(text):
         return "vp_director"
-    if any(keyword in text for keyword in ["manager", "supervisor", "lead"]):
+    if MANAGER_TITLE_MATCHER.search(text):
         return "manager"
-    if any(keyword in text for keyword in ["engineer", "engineering", "systems", "automation", "controls"]):
+    if ENGINEER_TITLE_MATCHER.search(text):
         return "engineer"
     return "unknown"
 
 
-def compute_job_tenure_years(job_start_date: str) -> float | None:
+def compute_job_tenure_years(job_start_date: str, now: datetime | None = None) -> float | None:
     if not job_start_date:
         return None
     try:
         start = datetime.fromisoformat(job_start_date.replace("Z", "+00:00"))
     except ValueError:
         return None
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     delta = now - start
     return delta.days / 365.25
 
 
-def compute_automation_readiness(features: dict) -> int:
+@dataclass(slots=True)
+class LeadFeatures:
+    """Per-lead scoring inputs produced by extract_features."""
+
+    industry: str = ""
+    employee_count: int = 0
+    technologies: list = field(default_factory=list)
+    tech_stack_depth: int = 0
+    tech_lower: str = ""
+    tech_lower_set: frozenset = frozenset()
+    wms_present: bool = False
+    enterprise_wms: bool = False
+    controls_roles_hiring: bool = False
+    automation_signals: bool = False
+    job_postings_relevant: int = 0
+    job_postings_count: int = 0
+    locations: list = field(default_factory=list)
+    title: str = ""
+    title_lower: str = ""
+    seniority: str = ""
+    department: str = ""
+    job_tenure_years: float | None = None
+
+    def get(self, key: str, default=None):
+        """Dict-style access for callers written against the old features dict."""
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+def compute_automation_readiness(features: LeadFeatures) -> int:
     score = 0
-    if features.get("wms_present"):
+    if features.wms_present:
         score += 20
-    if features.get("enterprise_wms"):
+    if features.enterprise_wms:
         score += 10
-    if features.get("controls_roles_hiring"):
+    if features.controls_roles_hiring:
         score += 20
-    if features.get("employee_count", 0) >= 400:
+    if features.employee_count >= 400:
         score += 15
-    tenure = features.get("job_tenure_years")
+    tenure = features.job_tenure_years
     if tenure is not None and tenure < 3:
         score += 10
-    if features.get("job_postings_relevant", 0) >= 3:
+    if features.job_postings_relevant >= 3:
         score += 10
-    if features.get("tech_stack_depth", 0) >= 8:
+    if features.tech_stack_depth >= 8:
         score += 5
-    if features.get("automation_signals"):
+    if features.automation_signals:
         score += 10
     return min(score, 100)
 
 
-def extract_features(person_record: dict, company_record: dict) -> dict:
+def extract_features(person_record: dict, company_record: dict, now: datetime | None = None) -> LeadFeatures:
     industry = normalize_text(company_record.get("industry", ""))
     employee_count = parse_employee_count(company_record.get("employee_count", 0))
     technologies = ensure_list(company_record.get("technologies"))
     tech_stack_depth = len(technologies)
     tech_lower = normalize_text(" ".join(technologies))
-    wms_present = contains_any(tech_lower, WMS_KEYWORDS)
-    enterprise_wms = any(keyword in tech_lower for keyword in ["manhattan", "blue yonder", "jda", "sap", "oracle"])
+    tech_lower_set = frozenset(normalize_text(tech) for tech in technologies)
+    wms_present = not tech_lower_set.isdisjoint(WMS_KEYWORDS_SET) or WMS_MATCHER.search(tech_lower)
+    enterprise_wms = (
+        not tech_lower_set.isdisjoint(ENTERPRISE_WMS_KEYWORDS_SET) or ENTERPRISE_WMS_MATCHER.search(tech_lower)
+    )
     automation_signals = ensure_list(company_record.get("equipment_signals"))
-    automation_present = any(signal in ["automation", "asrs", "agv_amr", "sortation", "shuttle"] for signal in automation_signals)
+    automation_present = any(signal in AUTOMATION_SIGNAL_SET for signal in automation_signals)
     controls_roles_hiring = bool(company_record.get("controls_roles_hiring"))
     job_postings_relevant = int(company_record.get("job_postings_relevant", 0) or 0)
     job_postings_count = int(company_record.get("job_postings_count", 0) or 0)
@@ -168,116 +319,136 @@ def extract_features(person_record: dict, company_record: dict) -> dict:
     title_lower = normalize_text(title)
     seniority = normalize_text(person_record.get("seniority", ""))
     department = normalize_text(person_record.get("department", ""))
-    job_tenure_years = compute_job_tenure_years(person_record.get("job_start_date"))
-
-    return {
-        "industry": industry,
-        "employee_count": employee_count,
-        "technologies": technologies,
-        "tech_stack_depth": tech_stack_depth,
-        "wms_present": wms_present,
-        "enterprise_wms": enterprise_wms,
-        "controls_roles_hiring": controls_roles_hiring,
-        "automation_signals": automation_present,
-        "job_postings_relevant": job_postings_relevant,
-        "job_postings_count": job_postings_count,
-        "locations": locations,
-        "title": title,
-        "title_lower": title_lower,
-        "seniority": seniority,
-        "department": department,
-        "job_tenure_years": job_tenure_years
-    }
-
-
-def score_icp(features: dict) -> tuple[str, int, dict]:
+    job_tenure_years = compute_job_tenure_years(person_record.get("job_start_date"), now)
+
+    return LeadFeatures(
+        industry=industry,
+        employee_count=employee_count,
+        technologies=technologies,
+        tech_stack_depth=tech_stack_depth,
+        tech_lower=tech_lower,
+        tech_lower_set=tech_lower_set,
+        wms_present=wms_present,
+        enterprise_wms=enterprise_wms,
+        controls_roles_hiring=controls_roles_hiring,
+        automation_signals=automation_present,
+        job_postings_relevant=job_postings_relevant,
+        job_postings_count=job_postings_count,
+        locations=locations,
+        title=title,
+        title_lower=title_lower,
+        seniority=seniority,
+        department=department,
+        job_tenure_years=job_tenure_years
+    )
+
+
+def score_icp(features: LeadFeatures) -> tuple[str, int, dict]:
     scores = {"ICP 1": 0, "ICP 2": 0, "ICP 3": 0, "ICP 4": 0, "ICP 5": 0}
     reasons = {key: [] for key in scores}
 
-    industry = features.get("industry", "")
-    employee_count = features.get("employee_count", 0)
-    title_lower = features.get("title_lower", "")
-    job_postings_relevant = features.get("job_postings_relevant", 0)
-    tech_stack_depth = features.get("tech_stack_depth", 0)
-
-    if contains_any(industry, LOGISTICS_KEYWORDS):
+    industry = features.industry
+    employee_count = features.employee_count
+    title_lower = features.title_lower
+    job_postings_relevant = features.job_postings_relevant
+    tech_stack_depth = features.tech_stack_depth
+    industry_categories = classify_industry(industry)
+    is_logistics = "logistics" in industry_categories
+    is_cold_storage = "cold_storage" in industry_categories
+    is_manufacturing = "manufacturing" in industry_categories
+    is_ecommerce = "ecommerce" in industry_categories
+    ops_title = OPS_TITLE_MATCHER.search(title_lower)
+
+    if is_logistics:
         scores["ICP 1"] += 2
         reasons["ICP 1"].append("logistics_industry")
     if 200 <= employee_count <= 800:
         scores["ICP 1"] += 1
         reasons["ICP 1"].append("mid_headcount")
-    if features.get("wms_present"):
+    if features.wms_present:
         scores["ICP 1"] += 1
         reasons["ICP 1"].append("wms_present")
-    if contains_any(title_lower, OPS_TITLE_KEYWORDS):
+    if ops_title:
         scores["ICP 1"] += 1
         reasons["ICP 1"].append("ops_title")
 
-    if contains_any(industry, COLD_STORAGE_KEYWORDS):
+    if is_cold_storage:
         scores["ICP 2"] += 2
         reasons["ICP 2"].append("cold_storage_industry")
     if 150 <= employee_count <= 600:
         scores["ICP 2"] += 1
         reasons["ICP 2"].append("mid_headcount")
-    if contains_any(title_lower, OPS_TITLE_KEYWORDS) or contains_any(title_lower, QA_TITLE_KEYWORDS):
+    if ops_title or QA_TITLE_MATCHER.search(title_lower):
         scores["ICP 2"] += 1
         reasons["ICP 2"].append("ops_or_qa_title")
     if tech_stack_depth <= 5:
         scores["ICP 2"] += 1
         reasons["ICP 2"].append("lighter_tech_stack")
 
-    if contains_any(industry, MANUFACTURING_KEYWORDS):
-        scores["ICP 3"] += 2
-        reasons["ICP 3"].append("manufacturing_industry")
-    if contains_any(normalize_text(" ".join(features.get("technologies", []))), ERP_KEYWORDS):
-        scores["ICP 3"] += 1
-        reasons["ICP 3"].append("erp_present")
-    if not features.get("wms_present"):
-        scores["ICP 3"] += 1
-        reasons["ICP 3"].append("limited_wms")
-
-    if contains_any(industry, ECOMMERCE_KEYWORDS):
+    if is_ecommerce:
         scores["ICP 4"] += 2
         reasons["ICP 4"].append("ecommerce_industry")
     if employee_count >= 500:
         scores["ICP 4"] += 1
         reasons["ICP 4"].append("large_headcount")
-    if features.get("wms_present"):
+    if features.wms_present:
         scores["ICP 4"] += 1
         reasons["ICP 4"].append("wms_present")
     if job_postings_relevant >= 5:
         scores["ICP 4"] += 1
         reasons["ICP 4"].append("growth_hiring")
-    if len(features.get("locations", [])) >= 2:
+    if len(features.locations) >= 2:
         scores["ICP 4"] += 1
         reasons["ICP 4"].append("multi_site")
 
-    if features.get("wms_present"):
+    if features.wms_present:
         scores["ICP 5"] += 1
         reasons["ICP 5"].append("wms_present")
-    if features.get("controls_roles_hiring"):
+    if features.controls_roles_hiring:
         scores["ICP 5"] += 1
         reasons["ICP 5"].append("controls_hiring")
     if employee_count >= 400:
         scores["ICP 5"] += 1
         reasons["ICP 5"].append("large_headcount")
-    tenure = features.get("job_tenure_years")
+    tenure = features.job_tenure_years
     if tenure is not None and tenure < 3:
         scores["ICP 5"] += 1
         reasons["ICP 5"].append("recent_hire")
-    if features.get("automation_signals"):
+    if features.automation_signals:
         scores["ICP 5"] += 1
         reasons["ICP 5"].append("automation_signals")
 
+    # ICP 3 goes last so its ERP scan only runs when the extra point could make
+    # it the winner (it loses ties to ICP 1/2 and wins them against ICP 4/5).
+    icp3_reasons = reasons["ICP 3"]
+    if is_manufacturing:
+        scores["ICP 3"] += 2
+        icp3_reasons.append("manufacturing_industry")
+    limited_wms = not features.wms_present
+    with_erp = scores["ICP 3"] + limited_wms + 1
+    if (
+        with_erp > max(scores["ICP 1"], scores["ICP 2"])
+        and with_erp >= max(scores["ICP 4"], scores["ICP 5"])
+        and (
+            not features.tech_lower_set.isdisjoint(ERP_KEYWORDS_SET)
+            or ERP_MATCHER.search(features.tech_lower)
+        )
+    ):
+        scores["ICP 3"] += 1
+        icp3_reasons.append("erp_present")
+    if limited_wms:
+        scores["ICP 3"] += 1
+        icp3_reasons.append("limited_wms")
+
     best_icp = max(scores, key=scores.get)
     if scores[best_icp] == 0:
-        if contains_any(industry, MANUFACTURING_KEYWORDS):
+        if is_manufacturing:
             best_icp = "ICP 3"
-        elif contains_any(industry, COLD_STORAGE_KEYWORDS):
+        elif is_cold_storage:
             best_icp = "ICP 2"
-        elif contains_any(industry, ECOMMERCE_KEYWORDS):
+        elif is_ecommerce:
             best_icp = "ICP 4"
-        elif contains_any(industry, LOGISTICS_KEYWORDS):
+        elif is_logistics:
             best_icp = "ICP 1"
         else:
             best_icp = "ICP 1"
@@ -302,5 +473,12 @@ def assign_strategy(icp_match: str, readiness_score: int, threshold: int = 65, h
     return "conventional"
 
 
+@lru_cache(maxsize=8192)
 def stable_hash(value: str) -> str:
+    """SHA-256 hex digest of ``value``.
+
+    The digest is persisted (``hash:`` person/company keys in lead_registry),
+    so the algorithm must not change without migrating those keys. Repeat
+    inputs are served from the cache.
+    """
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
@@ -0,0 +1,176 @@
+"""
+Vectorized lead scoring over pandas DataFrames.
+
+Kept apart from lead_scoring so that importing the per-lead scorers (as
+lead_registry and the backend do) does not pull in pandas, numpy or numba.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from lead_scoring import (
+    AUTOMATION_SIGNAL_SET,
+    COLD_STORAGE_MATCHER,
+    ECOMMERCE_MATCHER,
+    ENTERPRISE_WMS_MATCHER,
+    ERP_MATCHER,
+    LOGISTICS_MATCHER,
+    MANUFACTURING_MATCHER,
+    OPS_TITLE_MATCHER,
+    QA_TITLE_MATCHER,
+    WMS_MATCHER,
+    compute_job_tenure_years,
+    ensure_list,
+    normalize_text,
+)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def compute_automation_readiness_arr(
+        wms_present, enterprise_wms, controls_roles_hiring, emp, tenure, postings_rel, tech_depth, auto_signals
+    ):
+        """Array form of compute_automation_readiness; ``tenure`` is NaN where unknown."""
+        n = wms_present.shape[0]
+        out = np.empty(n, dtype=np.int32)
+        for i in prange(n):
+            score = np.int32(0)
+            if wms_present[i]:
+                score += 20
+            if enterprise_wms[i]:
+                score += 10
+            if controls_roles_hiring[i]:
+                score += 20
+            if emp[i] >= 400:
+                score += 15
+            if tenure[i] < 3:
+                score += 10
+            if postings_rel[i] >= 3:
+                score += 10
+            if tech_depth[i] >= 8:
+                score += 5
+            if auto_signals[i]:
+                score += 10
+            out[i] = score
+        return np.minimum(out, 100)
+else:
+    def compute_automation_readiness_arr(
+        wms_present, enterprise_wms, controls_roles_hiring, emp, tenure, postings_rel, tech_depth, auto_signals
+    ):
+        """Array form of compute_automation_readiness; ``tenure`` is NaN where unknown."""
+        score = (
+            20 * np.asarray(wms_present, dtype=np.int32)
+            + 10 * np.asarray(enterprise_wms, dtype=np.int32)
+            + 20 * np.asarray(controls_roles_hiring, dtype=np.int32)
+            + 15 * (np.asarray(emp) >= 400)
+            + 10 * (np.asarray(tenure, dtype=np.float64) < 3)
+            + 10 * (np.asarray(postings_rel) >= 3)
+            + 5 * (np.asarray(tech_depth) >= 8)
+            + 10 * np.asarray(auto_signals, dtype=np.int32)
+        )
+        return np.minimum(score, 100).astype(np.int32)
+
+
+ICP_LABELS = np.array(["ICP 1", "ICP 2", "ICP 3", "ICP 4", "ICP 5"])
+
+
+def _column(frame: pd.DataFrame, name: str, default) -> pd.Series:
+    if name in frame:
+        # Missing cells come back from pandas as NaN; treat them like absent keys
+        return frame[name].astype(object).where(frame[name].notna(), default)
+    return pd.Series([default] * len(frame), index=frame.index, dtype=object)
+
+
+def score_icp_batch(
+    people_df: pd.DataFrame, company_df: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score many leads at once; vectorized equivalent of extract_features + score_icp.
+
+    ``people_df`` and ``company_df`` are aligned by position (row i of each
+    describes the same lead) and use the same column names as the person and
+    company records passed to extract_features. Returns ``(icp_match, icp_score,
+    readiness_score)`` arrays, the last matching compute_automation_readiness;
+    per-lead reasons are not produced, use score_icp for those.
+    """
+    people_df = people_df.reset_index(drop=True)
+    company_df = company_df.reset_index(drop=True)
+    if len(people_df) != len(company_df):
+        raise ValueError("people_df and company_df must have the same number of rows")
+
+    industry = _column(company_df, "industry", "").map(normalize_text).astype(str)
+    title_lower = _column(people_df, "title", "").map(normalize_text).astype(str)
+    employee_count = (
+        pd.to_numeric(_column(company_df, "employee_count", 0), errors="coerce")
+        .replace([np.inf, -np.inf], np.nan)
+        .fillna(0)
+        .to_numpy()
+        .astype(np.int64)
+    )
+    technologies = _column(company_df, "technologies", None).map(ensure_list)
+    tech_lower = technologies.map(lambda techs: normalize_text(" ".join(techs))).astype(str)
+    tech_stack_depth = technologies.map(len).to_numpy()
+    job_postings_relevant = (
+        pd.to_numeric(_column(company_df, "job_postings_relevant", 0), errors="coerce").fillna(0).to_numpy()
+    )
+    location_count = _column(company_df, "locations", None).map(ensure_list).map(len).to_numpy()
+    controls_roles_hiring = _column(company_df, "controls_roles_hiring", False).map(bool).to_numpy()
+    automation_signals = (
+        _column(company_df, "equipment_signals", None)
+        .map(ensure_list)
+        .map(lambda signals: any(signal in AUTOMATION_SIGNAL_SET for signal in signals))
+        .to_numpy()
+    )
+    now = datetime.now(timezone.utc)
+    tenure = _column(people_df, "job_start_date", None).map(lambda start: compute_job_tenure_years(start, now))
+    recent_hire = (tenure.notna() & (tenure.astype(float) < 3)).to_numpy()
+
+    is_logistics = industry.str.contains(LOGISTICS_MATCHER.regex).to_numpy()
+    is_cold_storage = industry.str.contains(COLD_STORAGE_MATCHER.regex).to_numpy()
+    is_manufacturing = industry.str.contains(MANUFACTURING_MATCHER.regex).to_numpy()
+    is_ecommerce = industry.str.contains(ECOMMERCE_MATCHER.regex).to_numpy()
+    ops_title = title_lower.str.contains(OPS_TITLE_MATCHER.regex).to_numpy()
+    qa_title = title_lower.str.contains(QA_TITLE_MATCHER.regex).to_numpy()
+    wms_present = tech_lower.str.contains(WMS_MATCHER.regex).to_numpy()
+    enterprise_wms = tech_lower.str.contains(ENTERPRISE_WMS_MATCHER.regex).to_numpy()
+    erp_present = tech_lower.str.contains(ERP_MATCHER.regex).to_numpy()
+
+    scores = np.stack([
+        2 * is_logistics + ((employee_count >= 200) & (employee_count <= 800)) + wms_present + ops_title,
+        2 * is_cold_storage + ((employee_count >= 150) & (employee_count <= 600))
+        + (ops_title | qa_title) + (tech_stack_depth <= 5),
+        2 * is_manufacturing + erp_present + ~wms_present,
+        2 * is_ecommerce + (employee_count >= 500) + wms_present
+        + (job_postings_relevant >= 5) + (location_count >= 2),
+        wms_present.astype(np.int64) + controls_roles_hiring + (employee_count >= 400)
+        + recent_hire + automation_signals,
+    ]).astype(np.int64)
+
+    best = np.argmax(scores, axis=0)
+    best_score = scores[best, np.arange(len(best))]
+    # Same industry fallback order as score_icp when nothing scored
+    fallback = np.select(
+        [is_manufacturing, is_cold_storage, is_ecommerce, is_logistics],
+        [2, 1, 3, 0],
+        default=0
+    )
+    best = np.where(best_score == 0, fallback, best)
+
+    readiness = compute_automation_readiness_arr(
+        wms_present.astype(bool),
+        enterprise_wms.astype(bool),
+        controls_roles_hiring.astype(bool),
+        employee_count,
+        tenure.astype(float).to_numpy(),
+        job_postings_relevant.astype(np.float64),
+        tech_stack_depth.astype(np.int64),
+        automation_signals.astype(bool),
+    )
+    return ICP_LABELS[best], best_score, readiness
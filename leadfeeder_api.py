@@ -7,23 +7,49 @@ Replaces the Selenium-based scraper with reliable API calls.
 API Documentation: https://docs.leadfeeder.com/api/
 """
 
+import asyncio
 import logging
+import httpx
 import requests
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Dict, Optional
+
+from requests.adapters import HTTPAdapter
 
 from config import Config
-from lead_registry import get_connection, utc_now
+from lead_registry import get_connection, sql_value, utc_now
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# visitor_companies.company_key is the domain with "." and "-" turned into "_"
+_COMPANY_KEY_TRANS = str.maketrans(".-", "__")
+
 
 class LeadfeederAPI:
     """Client for Leadfeeder API v2."""
 
     BASE_URL = "https://api.leadfeeder.com"
 
+    # Pages fetched in flight at once when the total page count is known
+    MAX_CONCURRENT_PAGES = 10
+
+    # How long get_accounts reuses its last response
+    ACCOUNTS_CACHE_TTL = 300  # seconds
+
+    # Accounts synced in parallel by sync_leadfeeder_data
+    MAX_ACCOUNT_WORKERS = 4
+
     def __init__(self, api_token: str = None):
         """
         Initialize Leadfeeder API client.
@@ -41,33 +67,54 @@ class LeadfeederAPI:
             "User-Agent": "PersonalizedOutreach/1.0",
             "Accept": "application/json"
         })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._accounts_cache = None  # (fetched_at, accounts)
 
         # Rate limiting: 100 requests per minute
         self.rate_limit = 100
         self.rate_limit_window = 60  # seconds
-        self.request_times = []
+        self.request_times = deque()
+        # Shared by every thread using this client, so the window is checked under a lock
+        self._rl_lock = threading.Lock()
 
     def _rate_limit_check(self):
-        """Enforce rate limiting (100 requests per minute)."""
-        now = time.time()
-
-        # Remove requests older than the time window
-        self.request_times = [t for t in self.request_times if now - t < self.rate_limit_window]
-
-        # If at limit, wait until oldest request expires
-        if len(self.request_times) >= self.rate_limit:
-            sleep_time = self.rate_limit_window - (now - self.request_times[0]) + 0.1
-            if sleep_time > 0:
-                logger.info(f"Rate limit reached, waiting {sleep_time:.1f}s")
-                time.sleep(sleep_time)
-                # Re-clean after waiting
-                now = time.time()
-                self.request_times = [t for t in self.request_times if now - t < self.rate_limit_window]
-
-        # Record this request
-        self.request_times.append(now)
-
-    def _request(self, method: str, endpoint: str, params: dict = None, json_data: dict = None) -> dict:
+        """Enforce rate limiting (100 requests per minute), blocking until a slot is free."""
+        while (wait := self._reserve_request_slot()) > 0:
+            logger.info(f"Rate limit reached, waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    async def _rate_limit_check_async(self):
+        """Async _rate_limit_check: waits with asyncio.sleep so other requests keep running."""
+        while (wait := self._reserve_request_slot()) > 0:
+            logger.info(f"Rate limit reached, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    def _reserve_request_slot(self) -> float:
+        """
+        Record a request if the window has room.
+
+        Returns 0 when the request was recorded, otherwise the seconds to wait
+        before trying again. Never sleeps, so the lock is only held briefly.
+        """
+        with self._rl_lock:
+            now = time.time()
+
+            # Remove requests older than the time window (timestamps are appended in order)
+            while self.request_times and now - self.request_times[0] >= self.rate_limit_window:
+                self.request_times.popleft()
+
+            # If at limit, wait until oldest request expires
+            if len(self.request_times) >= self.rate_limit:
+                return self.rate_limit_window - (now - self.request_times[0]) + 0.1
+
+            # Record this request
+            self.request_times.append(now)
+            return 0
+
+    def _request(self, method: str, endpoint: str, params: dict = None, json_data: dict = None,
+                 stream: bool = False):
         """
         Make an API request with rate limiting and error handling.
 
@@ -76,9 +123,10 @@ class LeadfeederAPI:
             endpoint: API endpoint path
             params: Query parameters
             json_data: JSON body data
+            stream: Return the unread response instead of parsed JSON (caller closes it)
 
         Returns:
-            Response JSON data
+            Response JSON data, or the requests.Response when stream is set
 
         Raises:
             requests.HTTPError: On API errors
@@ -93,16 +141,19 @@ class LeadfeederAPI:
                 url=url,
                 params=params,
                 json=json_data,
-                timeout=30
+                timeout=30,
+                stream=stream
             )
             response.raise_for_status()
+            if stream:
+                return response
             return response.json()
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
                 logger.warning("Rate limit exceeded, waiting 60s before retry")
                 time.sleep(60)
-                return self._request(method, endpoint, params, json_data)
+                return self._request(method, endpoint, params, json_data, stream)
             elif e.response.status_code == 401:
                 logger.error("Leadfeeder API authentication failed - check API token")
                 raise ValueError("Invalid Leadfeeder API token")
@@ -113,19 +164,168 @@ class LeadfeederAPI:
             logger.error(f"Leadfeeder API request failed: {e}")
             raise
 
-    def get_accounts(self) -> List[Dict]:
+    async def _request_async(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                             endpoint: str, params: dict = None) -> dict:
+        """
+        Async GET used for concurrent page fetches; mirrors _request's error handling.
+
+        Raises:
+            httpx.HTTPStatusError: On API errors
+        """
+        async with semaphore:
+            while True:
+                await self._rate_limit_check_async()
+                try:
+                    response = await client.get(f"{self.BASE_URL}{endpoint}", params=params)
+                    response.raise_for_status()
+                    return response.json()
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 429:
+                        logger.warning("Rate limit exceeded, waiting 60s before retry")
+                        await asyncio.sleep(60)
+                        continue
+                    elif e.response.status_code == 401:
+                        logger.error("Leadfeeder API authentication failed - check API token")
+                        raise ValueError("Invalid Leadfeeder API token")
+                    logger.error(f"Leadfeeder API error: {e.response.status_code} - {e.response.text}")
+                    raise
+                except httpx.HTTPError as e:
+                    logger.error(f"Leadfeeder API request failed: {e}")
+                    raise
+
+    async def _fetch_pages_async(self, endpoint: str, base_params: dict, page_numbers: range) -> List[dict]:
+        """Fetch the given pages concurrently, bounded by MAX_CONCURRENT_PAGES. Results keep page order."""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+        async with httpx.AsyncClient(headers=dict(self.session.headers), timeout=30) as client:
+            return await asyncio.gather(*[
+                self._request_async(client, semaphore, endpoint, {**base_params, "page[number]": page_number})
+                for page_number in page_numbers
+            ])
+
+    def _iter_page_items(self, response: requests.Response, page_info: dict) -> Iterator[Dict]:
+        """
+        Yield the items of a streamed list response one at a time.
+
+        links.next and meta.page_count are stored in page_info as they are
+        parsed, so they are complete once the generator is exhausted.
+        """
+        with response:
+            if not IJSON_AVAILABLE:
+                body = response.json()
+                page_info["next"] = (body.get("links") or {}).get("next")
+                page_info["page_count"] = (body.get("meta") or {}).get("page_count")
+                yield from body.get("data", [])
+                return
+
+            response.raw.decode_content = True
+            builder = None
+            for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                if builder is None and prefix == "data.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == "data.item" and event == "end_map":
+                        yield builder.value
+                        builder = None
+                elif prefix == "links.next":
+                    page_info["next"] = value
+                elif prefix == "meta.page_count":
+                    page_info["page_count"] = value
+
+    def _iter_paginated(
+        self,
+        endpoint: str,
+        start_date: str,
+        end_date: str,
+        page_size: int,
+        max_pages: int,
+        label: str
+    ) -> Iterator[Dict]:
+        """
+        Yield every item of a paginated list endpoint.
+
+        Page 1 is streamed and parsed incrementally. If the response reports the
+        total page count (meta.page_count), the remaining pages are fetched
+        concurrently, MAX_CONCURRENT_PAGES at a time; otherwise links.next is
+        followed one streamed page at a time.
+        """
+        base_params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "page[size]": page_size
+        }
+
+        total = 0
+        page_number = 1
+
+        while True:
+            if max_pages and page_number > max_pages:
+                logger.info(f"Reached max pages limit ({max_pages})")
+                break
+
+            logger.info(f"Fetching page {page_number} (size: {page_size})")
+            response = self._request(
+                "GET", endpoint, params={**base_params, "page[number]": page_number}, stream=True
+            )
+
+            page_info = {}
+            count = 0
+            for item in self._iter_page_items(response, page_info):
+                count += 1
+                yield item
+
+            if not count:
+                logger.info(f"No more {label} on page {page_number}")
+                break
+
+            total += count
+            logger.info(f"Retrieved {count} {label} (total: {total})")
+
+            # Check if there are more pages
+            if not page_info.get("next"):
+                logger.info("No more pages available")
+                break
+
+            page_count = page_info.get("page_count")
+            if page_number == 1 and page_count:
+                last_page = min(page_count, max_pages) if max_pages else page_count
+                if last_page > 1:
+                    logger.info(f"Fetching pages 2-{last_page} concurrently")
+                # Batches keep at most MAX_CONCURRENT_PAGES pages in memory
+                for first in range(2, last_page + 1, self.MAX_CONCURRENT_PAGES):
+                    batch = range(first, min(first + self.MAX_CONCURRENT_PAGES, last_page + 1))
+                    for page in asyncio.run(self._fetch_pages_async(endpoint, base_params, batch)):
+                        items = page.get("data", [])
+                        total += len(items)
+                        yield from items
+                break
+
+            page_number += 1
+
+        logger.info(f"Fetched total of {total} {label}")
+
+    def get_accounts(self, use_cache: bool = True) -> List[Dict]:
         """
         Get all accessible Leadfeeder accounts.
 
+        Args:
+            use_cache: Reuse a response fetched within ACCOUNTS_CACHE_TTL seconds
+
         Returns:
             List of account dictionaries with id, name, timezone, etc.
         """
+        if use_cache and self._accounts_cache:
+            fetched_at, accounts = self._accounts_cache
+            if time.time() - fetched_at < self.ACCOUNTS_CACHE_TTL:
+                return accounts
+
         logger.info("Fetching Leadfeeder accounts")
         response = self._request("GET", "/accounts")
 
         accounts = response.get("data", [])
         logger.info(f"Found {len(accounts)} Leadfeeder account(s)")
 
+        self._accounts_cache = (time.time(), accounts)
         return accounts
 
     def get_account(self, account_id: str) -> Dict:
@@ -142,6 +342,31 @@ class LeadfeederAPI:
         response = self._request("GET", f"/accounts/{account_id}")
         return response.get("data", {})
 
+    def iter_leads(
+        self,
+        account_id: str,
+        start_date: str = None,
+        end_date: str = None,
+        page_size: int = 100,
+        max_pages: int = None
+    ) -> Iterator[Dict]:
+        """
+        Yield leads (companies) for an account within a date range as they are parsed.
+
+        Same arguments as get_leads; use this when the leads are consumed once.
+        """
+        # Default date range: last 7 days
+        if not end_date or not start_date:
+            now = datetime.now(timezone.utc)
+            end_date = end_date or now.strftime("%Y-%m-%d")
+            start_date = start_date or (now - timedelta(days=7)).strftime("%Y-%m-%d")
+
+        logger.info(f"Fetching leads for account {account_id} from {start_date} to {end_date}")
+
+        return self._iter_paginated(
+            f"/accounts/{account_id}/leads", start_date, end_date, page_size, max_pages, "leads"
+        )
+
     def get_leads(
         self,
         account_id: str,
@@ -163,50 +388,7 @@ class LeadfeederAPI:
         Returns:
             List of lead dictionaries with company info and visit data
         """
-        # Default date range: last 7 days
-        if not end_date:
-            end_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
-
-        logger.info(f"Fetching leads for account {account_id} from {start_date} to {end_date}")
-
-        all_leads = []
-        page_number = 1
-
-        while True:
-            if max_pages and page_number > max_pages:
-                logger.info(f"Reached max pages limit ({max_pages})")
-                break
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date,
-                "page[size]": page_size,
-                "page[number]": page_number
-            }
-
-            logger.info(f"Fetching page {page_number} (size: {page_size})")
-            response = self._request("GET", f"/accounts/{account_id}/leads", params=params)
-
-            leads = response.get("data", [])
-            if not leads:
-                logger.info(f"No more leads on page {page_number}")
-                break
-
-            all_leads.extend(leads)
-            logger.info(f"Retrieved {len(leads)} leads (total: {len(all_leads)})")
-
-            # Check if there are more pages
-            links = response.get("links", {})
-            if not links.get("next"):
-                logger.info("No more pages available")
-                break
-
-            page_number += 1
-
-        logger.info(f"Fetched total of {len(all_leads)} leads")
-        return all_leads
+        return list(self.iter_leads(account_id, start_date, end_date, page_size, max_pages))
 
     def get_lead(self, account_id: str, lead_id: str) -> Dict:
         """
@@ -247,10 +429,10 @@ class LeadfeederAPI:
             List of visit dictionaries
         """
         # Default date range: last 7 days
-        if not end_date:
-            end_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        if not start_date:
-            start_date = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
+        if not end_date or not start_date:
+            now = datetime.now(timezone.utc)
+            end_date = end_date or now.strftime("%Y-%m-%d")
+            start_date = start_date or (now - timedelta(days=7)).strftime("%Y-%m-%d")
 
         if lead_id:
             endpoint = f"/accounts/{account_id}/leads/{lead_id}/visits"
@@ -259,42 +441,7 @@ class LeadfeederAPI:
             endpoint = f"/accounts/{account_id}/visits"
             logger.info(f"Fetching all visits for account {account_id} from {start_date} to {end_date}")
 
-        all_visits = []
-        page_number = 1
-
-        while True:
-            if max_pages and page_number > max_pages:
-                logger.info(f"Reached max pages limit ({max_pages})")
-                break
-
-            params = {
-                "start_date": start_date,
-                "end_date": end_date,
-                "page[size]": page_size,
-                "page[number]": page_number
-            }
-
-            logger.info(f"Fetching page {page_number} (size: {page_size})")
-            response = self._request("GET", endpoint, params=params)
-
-            visits = response.get("data", [])
-            if not visits:
-                logger.info(f"No more visits on page {page_number}")
-                break
-
-            all_visits.extend(visits)
-            logger.info(f"Retrieved {len(visits)} visits (total: {len(all_visits)})")
-
-            # Check if there are more pages
-            links = response.get("links", {})
-            if not links.get("next"):
-                logger.info("No more pages available")
-                break
-
-            page_number += 1
-
-        logger.info(f"Fetched total of {len(all_visits)} visits")
-        return all_visits
+        return list(self._iter_paginated(endpoint, start_date, end_date, page_size, max_pages, "visits"))
 
     def get_custom_feeds(self, account_id: str) -> List[Dict]:
         """
@@ -313,7 +460,35 @@ class LeadfeederAPI:
         return feeds
 
 
-def sync_leadfeeder_data(days_back: int = 7, account_id: str = None) -> dict:
+@lru_cache(maxsize=1)
+def _get_api() -> LeadfeederAPI:
+    """Shared client so repeated syncs reuse its HTTP session and account cache."""
+    return LeadfeederAPI()
+
+
+def _sync_account(api: LeadfeederAPI, account_id: str, start_date: str, end_date: str) -> dict:
+    """Fetch one account's leads for the date range and store them."""
+    leads_synced = 0
+
+    def counted_leads():
+        # Stream leads straight into storage, counting each one handed over
+        nonlocal leads_synced
+        for lead in api.iter_leads(
+            account_id=account_id,
+            start_date=start_date,
+            end_date=end_date
+        ):
+            leads_synced += 1
+            yield lead
+
+    # Store in database
+    stored_count = store_leadfeeder_api_data(counted_leads())
+
+    logger.info(f"Retrieved {leads_synced} leads from API for account {account_id}")
+    return {"account_id": account_id, "leads_synced": leads_synced, "leads_stored": stored_count}
+
+
+def sync_leadfeeder_data(days_back: int = 7, account_id: str = None, account_ids: List[str] = None) -> dict:
     """
     Sync data from Leadfeeder API to local database.
 
@@ -322,6 +497,7 @@ def sync_leadfeeder_data(days_back: int = 7, account_id: str = None) -> dict:
     Args:
         days_back: Number of days to look back for leads (default: 7)
         account_id: Optional specific account ID (auto-detects if not provided)
+        account_ids: Optional list of account IDs, synced in parallel (overrides account_id)
 
     Returns:
         Dictionary with sync results (success, leads_synced, etc.)
@@ -329,35 +505,36 @@ def sync_leadfeeder_data(days_back: int = 7, account_id: str = None) -> dict:
     logger.info(f"Starting Leadfeeder API sync (last {days_back} days)")
 
     try:
-        api = LeadfeederAPI()
-
-        # Get account ID if not provided
-        if not account_id:
-            accounts = api.get_accounts()
-            if not accounts:
-                logger.error("No Leadfeeder accounts found")
-                return {"success": False, "error": "no_accounts", "leads_synced": 0}
-
-            # Use first account
-            account_id = accounts[0].get("id")
-            account_name = accounts[0].get("attributes", {}).get("name", "Unknown")
-            logger.info(f"Using account: {account_name} (ID: {account_id})")
+        api = _get_api()
+
+        if not account_ids:
+            # Get account ID if not provided
+            if not account_id:
+                accounts = api.get_accounts()
+                if not accounts:
+                    logger.error("No Leadfeeder accounts found")
+                    return {"success": False, "error": "no_accounts", "leads_synced": 0}
+
+                # Use first account
+                account_id = accounts[0].get("id")
+                account_name = accounts[0].get("attributes", {}).get("name", "Unknown")
+                logger.info(f"Using account: {account_name} (ID: {account_id})")
+            account_ids = [account_id]
 
         # Calculate date range
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days_back)
+        start_str = start_date.strftime("%Y-%m-%d")
+        end_str = end_date.strftime("%Y-%m-%d")
 
-        # Fetch leads
-        leads = api.get_leads(
-            account_id=account_id,
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d")
-        )
+        # Accounts share the client, so its rate limiter bounds the combined request rate
+        with ThreadPoolExecutor(max_workers=min(api.MAX_ACCOUNT_WORKERS, len(account_ids))) as executor:
+            account_results = list(executor.map(
+                lambda acc_id: _sync_account(api, acc_id, start_str, end_str), account_ids
+            ))
 
-        logger.info(f"Retrieved {len(leads)} leads from API")
-
-        # Store in database
-        stored_count = store_leadfeeder_api_data(leads)
+        leads_synced = sum(result["leads_synced"] for result in account_results)
+        stored_count = sum(result["leads_stored"] for result in account_results)
 
         # Update integration status
         with get_connection() as conn:
@@ -369,13 +546,17 @@ def sync_leadfeeder_data(days_back: int = 7, account_id: str = None) -> dict:
 
         logger.info(f"Leadfeeder API sync complete: {stored_count} leads stored")
 
-        return {
+        result = {
             "success": True,
-            "leads_synced": len(leads),
+            "leads_synced": leads_synced,
             "leads_stored": stored_count,
-            "account_id": account_id,
-            "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+            "date_range": f"{start_str} to {end_str}"
         }
+        if len(account_results) == 1:
+            result["account_id"] = account_results[0]["account_id"]
+        else:
+            result["accounts"] = account_results
+        return result
 
     except Exception as e:
         logger.error(f"Leadfeeder API sync failed: {e}", exc_info=True)
@@ -391,121 +572,148 @@ def sync_leadfeeder_data(days_back: int = 7, account_id: str = None) -> dict:
         return {"success": False, "error": str(e), "leads_synced": 0}
 
 
-def store_leadfeeder_api_data(leads: List[Dict]) -> int:
+def store_leadfeeder_api_data(leads: Iterable[Dict]) -> int:
     """
     Store leads from Leadfeeder API into database.
 
+    Rows are collected first and written with executemany in a single
+    transaction. visitor_companies rows are upserted with ON CONFLICT on
+    company_key; the only lookup is one IN-list query that redirects leads to
+    an existing company stored under the same name but a different key.
+
     Args:
-        leads: List of lead dictionaries from API
+        leads: Lead dictionaries from API (any iterable; consumed once)
 
     Returns:
         Number of leads stored
     """
-    now = utc_now()
-    stored_count = 0
-
-    with get_connection() as conn:
-        for lead in leads:
-            try:
-                # Extract lead attributes
-                lead_id = lead.get("id")
-                attributes = lead.get("attributes", {})
-
-                company_name = attributes.get("name")
-                industry = attributes.get("industry")
-                employee_count = attributes.get("employee_count")
-                first_visit = attributes.get("first_visit_date")
-                last_visit = attributes.get("last_visit_date")
-                visit_count = attributes.get("visits", 0)
-                quality = attributes.get("quality")
-
-                # Try to extract domain from relationships or included data
-                # The API may include website info in relationships
-                domain = None
-                relationships = lead.get("relationships", {})
-                location = relationships.get("location", {}).get("data", {})
-                location_attrs = location.get("attributes", {}) if isinstance(location, dict) else {}
-
-                # Generate unique Leadfeeder ID
-                leadfeeder_id = f"lf_api_{lead_id}"
-
-                # Calculate expiry (Leadfeeder free tier: 7 days)
-                expires_at = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
-
-                # Store in leadfeeder_visits table
-                conn.execute("""
-                    INSERT OR REPLACE INTO leadfeeder_visits (
-                        leadfeeder_id, company_name, domain, industry,
-                        employee_count, country, page_views, visit_duration,
-                        first_visit_at, last_visit_at, pages_visited,
-                        referrer, scraped_at, expires_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    leadfeeder_id,
-                    company_name,
-                    domain,
-                    industry,
-                    employee_count,
-                    location_attrs.get("country"),
-                    visit_count,
-                    None,  # visit_duration not in basic API response
-                    first_visit,
-                    last_visit,
-                    "[]",  # pages_visited - would need separate visits API call
-                    None,  # referrer
-                    now,
-                    expires_at
+    now_dt = datetime.now(timezone.utc)
+    now = now_dt.isoformat()
+    # Calculate expiry once per batch (Leadfeeder free tier: 7 days)
+    expires_at = (now_dt + timedelta(days=7)).isoformat()
+    visit_rows = []
+    company_rows = []
+
+    for lead in leads:
+        try:
+            # Extract lead attributes
+            lead_id = lead.get("id")
+            attributes = lead.get("attributes", {})
+
+            # Validate here so a malformed lead is dropped alone rather than
+            # failing the executemany for the whole batch
+            company_name = sql_value(attributes.get("name"))
+            industry = sql_value(attributes.get("industry"))
+            employee_count = sql_value(attributes.get("employee_count"))
+            first_visit = sql_value(attributes.get("first_visit_date"))
+            last_visit = sql_value(attributes.get("last_visit_date"))
+            visit_count = sql_value(attributes.get("visits", 0))
+            quality = attributes.get("quality")
+
+            # Try to extract domain from relationships or included data
+            # The API may include website info in relationships
+            domain = None
+            relationships = lead.get("relationships", {})
+            location = relationships.get("location", {}).get("data", {})
+            location_attrs = location.get("attributes", {}) if isinstance(location, dict) else {}
+            country = sql_value(location_attrs.get("country"))
+
+            # Generate unique Leadfeeder ID
+            leadfeeder_id = f"lf_api_{lead_id}"
+
+            visit_rows.append((
+                leadfeeder_id,
+                company_name,
+                domain,
+                industry,
+                employee_count,
+                country,
+                visit_count,
+                None,  # visit_duration not in basic API response
+                first_visit,
+                last_visit,
+                "[]",  # pages_visited - would need separate visits API call
+                None,  # referrer
+                now,
+                expires_at
+            ))
+
+            # Sync to visitor_companies if we have enough info
+            if company_name and (domain or company_name):
+                # Generate company key
+                company_key = domain.translate(_COMPANY_KEY_TRANS) if domain else company_name.lower().replace(" ", "_")
+                company_rows.append((
+                    company_key, company_name, domain, industry, employee_count,
+                    country, visit_count, first_visit, last_visit
                 ))
 
-                # Sync to visitor_companies if we have enough info
-                if company_name and (domain or company_name):
-                    # Generate company key
-                    company_key = domain.replace(".", "_").replace("-", "_") if domain else company_name.lower().replace(" ", "_")
-
-                    # Check if company exists
-                    existing = conn.execute("""
-                        SELECT company_key, total_visits FROM visitor_companies
-                        WHERE company_key = ? OR company_name = ?
-                    """, (company_key, company_name)).fetchone()
-
-                    if existing:
-                        # Update existing
-                        conn.execute("""
-                            UPDATE visitor_companies
-                            SET total_visits = total_visits + ?,
-                                last_visit_at = ?,
-                                source = 'leadfeeder',
-                                industry = COALESCE(?, industry),
-                                employee_count = COALESCE(?, employee_count),
-                                country = COALESCE(?, country)
-                            WHERE company_key = ?
-                        """, (
-                            visit_count, last_visit,
-                            industry, employee_count,
-                            location_attrs.get("country"),
-                            existing["company_key"]
-                        ))
-                    else:
-                        # Insert new
-                        conn.execute("""
-                            INSERT INTO visitor_companies (
-                                company_key, company_name, domain, source,
-                                industry, employee_count, country,
-                                total_visits, first_visit_at, last_visit_at,
-                                created_at, updated_at
-                            ) VALUES (?, ?, ?, 'leadfeeder', ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            company_key, company_name, domain,
-                            industry, employee_count,
-                            location_attrs.get("country"), visit_count,
-                            first_visit or now, last_visit, now, now
-                        ))
-
-                stored_count += 1
-
-            except Exception as e:
-                logger.error(f"Failed to store lead {lead.get('id')}: {e}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Failed to store lead {lead.get('id')}: {e}", exc_info=True)
 
+    with get_connection() as conn:
+        # Existing rows can match on company_key or on company_name under a different key;
+        # one UNION ALL leg per column so each is an index seek (company_key is UNIQUE)
+        keys = list({row[0] for row in company_rows})
+        names = list({row[1] for row in company_rows})
+        existing_keys = set()
+        by_name = {}
+        chunk_size = 400  # stay well under SQLite's bound-parameter limit
+        for i in range(0, max(len(keys), len(names)), chunk_size):
+            key_chunk = keys[i:i + chunk_size]
+            name_chunk = names[i:i + chunk_size]
+            for row in conn.execute(
+                f"""
+                SELECT company_key, company_name FROM visitor_companies
+                WHERE company_key IN ({",".join("?" * len(key_chunk)) or "NULL"})
+                UNION ALL
+                SELECT company_key, company_name FROM visitor_companies
+                WHERE company_name IN ({",".join("?" * len(name_chunk)) or "NULL"})
+                """,
+                key_chunk + name_chunk
+            ):
+                existing_keys.add(row["company_key"])
+                by_name.setdefault(row["company_name"], row["company_key"])
+
+        company_upserts = []
+        for company_key, company_name, domain, industry, employee_count, country, visit_count, first_visit, last_visit in company_rows:
+            if company_key not in existing_keys:
+                company_key = by_name.setdefault(company_name, company_key)
+            company_upserts.append((
+                company_key, company_name, domain,
+                industry, employee_count,
+                country, visit_count,
+                first_visit or now, last_visit, now, now
+            ))
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO leadfeeder_visits (
+                leadfeeder_id, company_name, domain, industry,
+                employee_count, country, page_views, visit_duration,
+                first_visit_at, last_visit_at, pages_visited,
+                referrer, scraped_at, expires_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, visit_rows)
+
+        # Rows are applied in order, so a company seen twice in one batch is
+        # inserted by the first lead and updated by the next.
+        conn.executemany("""
+            INSERT INTO visitor_companies (
+                company_key, company_name, domain, source,
+                industry, employee_count, country,
+                total_visits, first_visit_at, last_visit_at,
+                created_at, updated_at
+            ) VALUES (?, ?, ?, 'leadfeeder', ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(company_key) DO UPDATE SET
+                total_visits = visitor_companies.total_visits + excluded.total_visits,
+                last_visit_at = excluded.last_visit_at,
+                source = 'leadfeeder',
+                industry = COALESCE(excluded.industry, visitor_companies.industry),
+                employee_count = COALESCE(excluded.employee_count, visitor_companies.employee_count),
+                country = COALESCE(excluded.country, visitor_companies.country),
+                updated_at = excluded.updated_at
+        """, company_upserts)
+
+    stored_count = len(visit_rows)
     logger.info(f"Stored {stored_count} leads from Leadfeeder API")
     return stored_count
 
@@ -513,8 +721,9 @@ def store_leadfeeder_api_data(leads: List[Dict]) -> int:
 def get_leadfeeder_status() -> dict:
     """Get current Leadfeeder integration status."""
     try:
-        api = LeadfeederAPI()
-        accounts = api.get_accounts()
+        api = _get_api()
+        # Status is a live check, so bypass the account cache
+        accounts = api.get_accounts(use_cache=False)
         api_working = True
         account_info = accounts[0] if accounts else None
     except Exception as e:
@@ -527,16 +736,15 @@ def get_leadfeeder_status() -> dict:
             SELECT * FROM integration_status WHERE integration_name = 'leadfeeder'
         """).fetchone()
 
-        company_count = conn.execute("""
-            SELECT COUNT(*) as count FROM leadfeeder_visits
-            WHERE expires_at > datetime('now')
-        """).fetchone()["count"]
-
-        expiring_soon = conn.execute("""
-            SELECT COUNT(*) as count FROM leadfeeder_visits
+        # One range scan of idx_leadfeeder_visits_expires answers both counts
+        counts = conn.execute("""
+            SELECT COUNT(*) as active,
+                   COUNT(CASE WHEN expires_at < datetime('now', '+2 days') THEN 1 END) as expiring
+            FROM leadfeeder_visits
             WHERE expires_at > datetime('now')
-            AND expires_at < datetime('now', '+2 days')
-        """).fetchone()["count"]
+        """).fetchone()
+        company_count = counts["active"]
+        expiring_soon = counts["expiring"]
 
     return {
         "configured": bool(Config.LEADFEEDER_API_KEY),
@@ -22,24 +22,411 @@ Selenium-based automation to scrape visitor data from Leadfeeder's free tier.
 Designed to capture data before the 7-day expiration window.
 """
 
+import atexit
+import base64
+import hashlib
 import logging
+import os
+import queue
+import shutil
+import tempfile
 import time
 import random
 import json
 import re
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
+from functools import cached_property, lru_cache
+from typing import Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from config import Config
-from lead_registry import get_connection, utc_now
+from lead_registry import get_connection, sql_value, utc_now
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+warnings.warn(
+    "leadfeeder_scraper is deprecated; use leadfeeder_api.sync_leadfeeder_data instead",
+    DeprecationWarning,
+    stacklevel=2
+)
+
+# Overall budget for one login attempt, and the cap on any single page load
+LOGIN_TIMEOUT_SECONDS = 60
+PAGE_LOAD_TIMEOUT_SECONDS = 20
+
+# WebDriver locators used by the login flow and page waits
+EMAIL_INPUT_LOCATOR = (By.CSS_SELECTOR, "input[type='email'], input[name='email']")
+PASSWORD_INPUT_LOCATOR = (By.CSS_SELECTOR, "input[type='password'], input[name='password']")
+SUBMIT_BUTTON_LOCATOR = (By.CSS_SELECTOR, "button[type='submit']")
+ERROR_MESSAGE_LOCATOR = (
+    By.CSS_SELECTOR,
+    "[role='alert'], .error, .alert-error, .alert-danger, [class*='error'], [class*='alert']"
+)
+COMPANY_LIST_READY_LOCATOR = (By.CSS_SELECTOR, "article, [role='button'], table tbody tr")
+
+# Selector fallbacks per company card field, tried in order (first match wins)
+COMPANY_FIELD_SELECTORS = {
+    "name": [
+        ".company-name", ".lead-name", "[class*='CompanyName']",
+        "h3", "h4", ".name", "[data-testid='company-name']"
+    ],
+    "domain": [
+        ".company-domain", ".domain", "[class*='Domain']",
+        "a[href*='http']", ".website"
+    ],
+    "views": [
+        ".page-views", ".visits", "[class*='PageView']",
+        "[class*='visits']", ".visit-count"
+    ],
+    "time": [
+        ".last-visit", ".time", "[class*='Time']",
+        ".visit-time", ".timestamp"
+    ],
+    "industry": [
+        ".industry", "[class*='Industry']", ".sector"
+    ],
+    "employees": [
+        ".employees", "[class*='Employee']", ".company-size"
+    ],
+    "country": [
+        ".country", "[class*='Country']", ".location"
+    ],
+}
+
+# Card selectors counted while scrolling; the first one that matches anything is used
+SCROLL_COUNT_SELECTORS = ["article", "[role='button'][class*='company']", "div[class*='CompanyCard']"]
+
+# Company card selectors, most specific first. The first one that matches anything
+# wins; a comma-union would let the broad fallbacks pull in navigation items.
+COMPANY_CARD_SELECTORS = [
+    # Card-based layout selectors (current Leadfeeder UI)
+    "[role='button'][class*='company']",  # Clickable company cards
+    "div[class*='CompanyCard']",  # Company card divs
+    "div[class*='company-item']",  # Company item divs
+    "div[class*='CompanyListItem']",  # List item pattern
+    "article",  # Semantic article elements
+    "li[class*='company']",  # List items with company class
+    "div[role='button']",  # Generic clickable divs (very broad)
+    # Table-based selectors (older UI)
+    "table tbody tr",  # Generic table rows
+    "[role='row']",  # ARIA table rows
+    ".MuiTableRow-root",  # Material UI table rows
+    # Original selectors
+    "[data-testid='company-row'], .company-row, .visitor-row",
+    "tr[class*='company'], tr[class*='visitor']",
+    # Alternative selectors
+    ".leads-list-item, .lead-item",
+    "[class*='LeadRow'], [class*='CompanyRow']",
+    # Very generic fallback
+    "ul > li",  # Any list items
+    "div[class*='list'] > div[class*='item']"
+]
+
+
+_SCROLL_JS_FN = """
+// Scroll the main window, the main content area, and the last card into view
+function scrollForMore(lastCard) {
+    window.scrollTo(0, document.body.scrollHeight);
+    const main = document.querySelector('main') || document.querySelector('[role="main"]');
+    if (main) {
+        main.scrollTop = main.scrollHeight;
+    }
+    if (lastCard) {
+        lastCard.scrollIntoView({behavior: 'smooth', block: 'end'});
+    }
+}
+"""
+
+SCROLL_PAGE_JS = _SCROLL_JS_FN + """
+const articles = document.querySelectorAll('article');
+scrollForMore(articles[articles.length - 1]);
+"""
+
+# Installed on every new document: counts fetch/XHR requests still in flight so
+# the scroll loop can wait for the next batch instead of sleeping a fixed time
+INFLIGHT_COUNTER_JS = """
+window.__lfInflight = 0;
+(function() {
+    const done = () => { window.__lfInflight = Math.max(0, window.__lfInflight - 1); };
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function() {
+            window.__lfInflight++;
+            return origFetch.apply(this, arguments).finally(done);
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__lfInflight++;
+        this.addEventListener('loadend', done, {once: true});
+        return origSend.apply(this, arguments);
+    };
+})();
+"""
+
+PAGE_LOAD_STATE_JS = """
+const main = document.querySelector('main') || document.querySelector('[role="main"]');
+return [document.readyState, window.__lfInflight || 0, document.body.scrollHeight, main ? main.scrollHeight : 0];
+"""
+
+# Post-submit URLs that suggest the fast form fill tripped bot detection
+_ANTI_BOT_URL_RE = re.compile(r"captcha|challenge|verify|blocked", re.IGNORECASE)
+
+# Still on the login/sign-in form (or its error page) rather than the dashboard
+_LOGIN_URL_RE = re.compile(r"login|sign", re.IGNORECASE)
+_LOGIN_FAILED_URL_RE = re.compile(r"login|sign|error", re.IGNORECASE)
+
+# Number and range parsing for card texts
+# A number with an optional k/m/b magnitude suffix glued to it ("1.2k").
+_NUM_RE = re.compile(r"([\d.]+)([kmb](?![a-z]))?")
+_MULT = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+# "now", or an optional count followed by a unit ("5 minutes ago", "an hour ago")
+_REL_TIME_RE = re.compile(r"now|(?:(\d+)(?:\.\d+)?\s*)?(minute|hour|day|week)")
+_REL_TIME_UNITS = {"minute": "minutes", "hour": "hours", "day": "days", "week": "weeks"}
+# visitor_companies.company_key is the domain with "." and "-" turned into "_"
+_COMPANY_KEY_TRANS = str.maketrans(".-", "__")
+_RANGE_RE = re.compile(r"(\d+)\s*[-–]\s*(\d+)")
+# Host part of a URL-ish string, without protocol, "www." or path
+_DOMAIN_RE = re.compile(r"(?:https?://)?(?:www\.)?([^/]*)")
+
+# Feed IDs in Dealfront (/f/123) and legacy Leadfeeder (/feeds/abc) URLs
+_FEED_RE = re.compile(r"/f/(\d+)")
+_OLD_FEED_RE = re.compile(r"/feeds/([^/]+)")
+_FEED_PAGE_RE = re.compile(r"/f/\d+/[^?]*")
+_OLD_FEED_PAGE_RE = re.compile(r"/feeds/[^/]+/[^/?]*")
+
+# XHR/fetch responses from Dealfront's own API that carry the company list
+_COMPANIES_API_RE = re.compile(r"/api/.+compan", re.IGNORECASE)
+
+# Parallel shard browsers: hard cap, and memory budgeted per Chrome instance
+MAX_SHARD_DRIVERS = 4
+CHROME_MEMORY_MB = 400
+
+# Days of visitor history on the Leadfeeder free tier, split across shards
+LEADFEEDER_RETENTION_DAYS = 7
+
+
+def _max_drivers_for_memory() -> int:
+    """How many Chrome instances fit in half of physical memory (1 if unknown)."""
+    try:
+        total_mb = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 1
+    return max(1, total_mb // 2 // CHROME_MEMORY_MB)
+
+
+def _auth_state_path(email: Optional[str]):
+    """Saved-session file for an account; extra accounts get their own file next to the default."""
+    default = Config.LEADFEEDER_AUTH_STATE_PATH
+    if not email or email == Config.LEADFEEDER_EMAIL:
+        return default
+    digest = hashlib.sha1(email.lower().encode("utf-8")).hexdigest()[:12]
+    return default.with_name(f"{default.stem}_{digest}{default.suffix}")
+
+
+def _mask_email(email: Optional[str]) -> str:
+    """Keep the first 3 and last 4 characters; short values are fully hidden."""
+    if not email or len(email) <= 7:
+        return "***"
+    return f"{email[:3]}...{email[-4:]}"
+
+
+@lru_cache(maxsize=1)
+def _debug_dir() -> str:
+    """Directory for debug captures, resolved and created on first use."""
+    directory = "/tmp/leadfeeder_screenshots" if os.path.isdir("/tmp") else "screenshots"
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _prune_debug_files(directory: str):
+    """Delete the oldest debug captures so at most LEADFEEDER_DEBUG_FILE_LIMIT remain."""
+    entries = sorted(os.scandir(directory), key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[Config.LEADFEEDER_DEBUG_FILE_LIMIT:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+# Idle shard browsers as (driver, profile dir), reused by the next sharded scrape
+# instead of paying Chrome startup again (see LeadfeederScraper.release)
+_DRIVER_POOL: "queue.Queue[tuple]" = queue.Queue(maxsize=MAX_SHARD_DRIVERS)
+
+
+def _drain_driver_pool():
+    """Quit every pooled shard browser and remove its temporary profile."""
+    while True:
+        try:
+            driver, profile_dir = _DRIVER_POOL.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled Chrome driver: {e}")
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+# Resources the scraper never reads. CSS stays enabled because card text is read
+# with innerText and the login waits check clickability, both of which depend on layout.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.webm",
+    "*/analytics/*", "*/tracking/*",
+]
+
+# Candidate keys for each company field in Dealfront's API records, in order
+API_FIELD_KEYS = {
+    "name": ("name", "company_name", "companyName"),
+    "domain": ("domain", "website", "website_url", "websiteUrl"),
+    "industry": ("industry", "industry_name", "industryName"),
+    "employees": ("employee_count", "employees", "employeeCount", "employees_range", "size"),
+    "country": ("country", "country_name", "countryName"),
+    "views": ("visits", "page_views", "pageViews", "visit_count", "visitCount"),
+    "last_visit": ("last_visit_date", "last_visit_at", "lastVisitAt", "lastVisitDate"),
+}
+
+# Read attributes (or innerText via "text") of many elements in one WebDriver call,
+# instead of one HTTP round-trip per get_attribute
+DESCRIBE_ELEMENTS_JS = """
+const [elements, names] = arguments;
+return elements.map(el => names.map(n => n === 'text' ? (el.innerText || '') : el.getAttribute(n)));
+"""
+
+# First 500 characters of the visible page text, sliced in the browser so a huge
+# dashboard's full innerText never crosses the wire
+BODY_PREVIEW_JS = "return (document.body ? document.body.innerText : '').slice(0, 500);"
+
+# Count [role='button'] elements and return class/text of the first 5, to show the
+# page structure when no card selector matched
+DESCRIBE_BUTTONS_JS = """
+const buttons = document.querySelectorAll("[role='button']");
+return [buttons.length, Array.from(buttons).slice(0, 5).map(
+    b => [b.getAttribute('class'), (b.innerText || '').slice(0, 50)]
+)];
+"""
+
+# Count the page's inputs and describe the first N, for login-form debugging
+DESCRIBE_INPUTS_JS = """
+const inputs = document.querySelectorAll('input');
+return [inputs.length, Array.from(inputs).slice(0, arguments[0]).map(
+    i => [i.getAttribute('type'), i.getAttribute('name'), i.getAttribute('id'), i.getAttribute('placeholder')]
+)];
+"""
+
+# Sets an input through the native value setter so React sees the change, then
+# fires the single input event its onChange listens for.
+SET_INPUT_VALUE_JS = """
+const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;
+setter.call(arguments[0], arguments[1]);
+arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
+"""
+
+# Runs in the page: resolves every field of every card locally and returns plain
+# strings, so a whole list costs one WebDriver round-trip instead of one per selector.
+_CARD_FIELDS_JS_FN = """
+function extractCardFields(cards, fieldSelectors) {
+    return cards.map(card => {
+        const fields = {};
+        for (const [field, selectors] of Object.entries(fieldSelectors)) {
+            fields[field] = null;
+            for (const selector of selectors) {
+                const el = card.querySelector(selector);
+                if (!el) continue;
+                const text = (el.innerText || '').trim();
+                fields[field] = (field === 'domain' && !text) ? el.getAttribute('href') : text;
+                break;
+            }
+        }
+        return fields;
+    });
+}
+
+// Cards already extracted are tagged, so each card is read once even when the
+// list is scanned repeatedly while scrolling
+function findUnseenCards(cardSelectors, fieldSelectors, limit) {
+    for (const selector of cardSelectors) {
+        const cards = Array.from(document.querySelectorAll(selector));
+        if (!cards.length) continue;
+        const unseen = cards.filter(card => !card.dataset.lfSeen).slice(0, limit);
+        unseen.forEach(card => { card.dataset.lfSeen = '1'; });
+        return [selector, cards.length, extractCardFields(unseen, fieldSelectors)];
+    }
+    return [null, 0, []];
+}
+"""
+
+EXTRACT_CARDS_JS = _CARD_FIELDS_JS_FN + """
+return extractCardFields(arguments[0], arguments[1]);
+"""
+
+# Find the cards with the first matching selector and extract their fields in the
+# same call, so card element references never cross the WebDriver wire
+FIND_CARDS_JS = _CARD_FIELDS_JS_FN + """
+const [cardSelectors, fieldSelectors, limit] = arguments;
+return findUnseenCards(cardSelectors, fieldSelectors, limit);
+"""
+
+# Count the cards loaded so far and extract the ones that appeared since the last scroll
+# and, when asked, scroll for the next batch from the same card list (one DOM scan)
+SCROLL_SCAN_JS = _CARD_FIELDS_JS_FN + _SCROLL_JS_FN + """
+const [countSelectors, cardSelectors, fieldSelectors, limit, scrollNext] = arguments;
+let cards = [];
+for (const selector of countSelectors) {
+    cards = document.querySelectorAll(selector);
+    if (cards.length) break;
+}
+const fields = findUnseenCards(cardSelectors, fieldSelectors, limit)[2];
+if (scrollNext) {
+    scrollForMore(cards[cards.length - 1]);
+}
+return [cards.length, fields];
+"""
+
+
+@dataclass(slots=True)
+class LeadfeederCompany:
+    """One visitor company parsed from the dashboard or its API responses."""
+
+    leadfeeder_id: str
+    company_name: Optional[str] = None
+    domain: Optional[str] = None
+    industry: Optional[str] = None
+    employee_count: Optional[int] = None
+    country: Optional[str] = None
+    page_views: Optional[int] = None
+    visit_duration: Optional[int] = None
+    first_visit_at: Optional[str] = None
+    last_visit_at: Optional[str] = None
+    pages_visited: list = field(default_factory=list)
+    referrer: Optional[str] = None
+
+    def get(self, key: str, default=None):
+        """Dict-style access for callers written against the old company dict."""
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
 
 class LeadfeederScraper:
     """Scrapes visitor data from Leadfeeder dashboard."""
@@ -53,8 +440,12 @@ class LeadfeederScraper:
         self.password = password or Config.LEADFEEDER_PASSWORD
         self.driver = None
         self.feed_id = None  # Will be set after login
+        self.shard_tag = None  # Keeps index-based IDs unique across parallel shards
+        self.profile_dir = None  # Temporary Chrome profile of a pooled shard browser
+        self.auth_state_path = _auth_state_path(self.email)
+        self._deadline = None  # monotonic time the current login attempt must finish by
 
-    def init_driver(self, headless: bool = True):
+    def init_driver(self, headless: bool = True, user_data_dir: str = None):
         """Initialize Chrome driver with anti-detection measures."""
         import os
         import shutil
@@ -83,6 +474,11 @@ class LeadfeederScraper:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        if user_data_dir:
+            # Separate profiles let several browsers run side by side
+            chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+            chrome_options.add_argument("--remote-debugging-port=0")
         if headless:
             chrome_options.add_argument("--disable-gpu")  # Only for headless mode
         chrome_options.add_argument(
@@ -91,6 +487,15 @@ class LeadfeederScraper:
         )
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        # driver.get() returns at DOMContentLoaded; every step after a navigation
+        # already waits explicitly for the element or URL it needs
+        chrome_options.page_load_strategy = "eager"
+        # Performance log lets scrape_visitors read the dashboard's own API responses
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
         # Check if running on Railway/Nixpacks with chromium
         chromium_path = shutil.which("chromium") or shutil.which("chromium-browser")
@@ -98,44 +503,138 @@ class LeadfeederScraper:
             chrome_options.binary_location = chromium_path
             logger.info(f"Using Chromium at: {chromium_path}")
 
-        self.driver = webdriver.Chrome(options=chrome_options)
+        # One keep-alive connection to chromedriver is reused for every command.
+        # Each driver is only ever driven by one thread (the singleton runs under
+        # _SCRAPER_LOCK, shard workers own theirs), so a larger urllib3 pool
+        # would never be used.
+        self.driver = webdriver.Chrome(options=chrome_options, keep_alive=True)
         self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
             'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
         })
+        self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INFLIGHT_COUNTER_JS})
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        # Explicit waits only: an implicit wait would stack under every WebDriverWait poll
+        self.driver.implicitly_wait(0)
+        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT_SECONDS)
 
         logger.info("Chrome driver initialized")
 
+    def _find_or_wait(self, locator: tuple, timeout: float):
+        """Return the first element matching locator right away, or wait for it to become clickable."""
+        elements = self.driver.find_elements(*locator)
+        if elements:
+            return elements[0]
+        return self._wait(timeout).until(EC.element_to_be_clickable(locator))
+
+    @cached_property
+    def _email_masked(self) -> str:
+        """Account email with most characters hidden, for log lines."""
+        return _mask_email(self.email)
+
+    def _wait(self, timeout: float) -> WebDriverWait:
+        """WebDriverWait capped by what is left of the login deadline (if one is running)."""
+        if self._deadline is not None:
+            timeout = max(1, min(timeout, self._deadline - time.monotonic()))
+        return WebDriverWait(self.driver, timeout)
+
     def _human_delay(self, min_seconds: float = 1, max_seconds: float = 3):
         """Add random delay to mimic human behavior."""
         time.sleep(random.uniform(min_seconds, max_seconds))
 
+    def _wait_url_change(self, old_url: str, timeout: float = 15) -> bool:
+        """Wait until the browser leaves old_url for a page that is not a login/sign-in page."""
+        def _left_login(driver):
+            url = driver.current_url
+            return url != old_url and not _LOGIN_URL_RE.search(url)
+
+        try:
+            self._wait(timeout).until(_left_login)
+        except TimeoutException:
+            logger.warning(f"URL did not change from {old_url} within {timeout}s")
+            return False
+
+        # The dashboard may redirect once more before the feed URL appears
+        try:
+            self._wait(5).until(
+                lambda driver: "/f/" in driver.current_url or "/feeds/" in driver.current_url
+            )
+        except TimeoutException:
+            pass
+        return True
+
     def _take_screenshot(self, name: str):
-        """Take a screenshot for debugging."""
+        """Take a screenshot for debugging (only when LEADFEEDER_DEBUG_SCREENSHOTS is on)."""
+        if not Config.LEADFEEDER_DEBUG_SCREENSHOTS:
+            return None
         try:
-            import os
-            screenshot_dir = "/tmp/leadfeeder_screenshots" if os.path.exists("/tmp") else "screenshots"
-            os.makedirs(screenshot_dir, exist_ok=True)
-            filepath = f"{screenshot_dir}/{name}_{datetime.now().strftime('%H%M%S')}.png"
-            self.driver.save_screenshot(filepath)
+            screenshot_dir = _debug_dir()
+            filepath = f"{screenshot_dir}/{name}_{datetime.now().strftime('%H%M%S')}.jpg"
+            # CDP hands back the encoded image directly; JPEG keeps it a fraction of the PNG size,
+            # and optimizeForSpeed picks Chrome's fast encoder settings over smallest output
+            result = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": 60,
+                "optimizeForSpeed": True,
+            })
+            with open(filepath, "wb") as f:
+                f.write(base64.b64decode(result["data"]))
+            _prune_debug_files(screenshot_dir)
             logger.info(f"Screenshot saved: {filepath}")
             return filepath
         except Exception as e:
             logger.warning(f"Failed to save screenshot: {e}")
 
     def _dump_page_html(self, name: str):
-        """Dump page HTML for debugging."""
+        """Dump page HTML for debugging (only when LEADFEEDER_DEBUG_SCREENSHOTS is on)."""
+        if not Config.LEADFEEDER_DEBUG_SCREENSHOTS:
+            return None
         try:
-            import os
-            html_dir = "/tmp/leadfeeder_screenshots" if os.path.exists("/tmp") else "screenshots"
-            os.makedirs(html_dir, exist_ok=True)
+            html_dir = _debug_dir()
             filepath = f"{html_dir}/{name}_{datetime.now().strftime('%H%M%S')}.html"
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(self.driver.page_source)
+            _prune_debug_files(html_dir)
             logger.info(f"HTML dump saved: {filepath}")
             return filepath
         except Exception as e:
             logger.warning(f"Failed to dump HTML: {e}")
 
+    def _evaluate(self, script: str):
+        """
+        Run an argument-free script body via CDP Runtime.evaluate.
+
+        Used for the scroll/settle polling loop: the value comes back as plain
+        JSON without execute_script's argument and element (de)serialization.
+        Scripts that take element arguments still go through execute_script.
+        """
+        result = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": f"(() => {{{script}}})()",
+            "returnByValue": True,
+        })
+        if "exceptionDetails" in result:
+            raise WebDriverException(f"Runtime.evaluate failed: {result['exceptionDetails'].get('text')}")
+        return result.get("result", {}).get("value")
+
+    def _describe_elements(self, elements: list, names: tuple) -> list:
+        """Return one tuple of attribute values per element, fetched in a single call."""
+        if not elements:
+            return []
+        return [tuple(values) for values in self.driver.execute_script(DESCRIBE_ELEMENTS_JS, elements, list(names))]
+
+    def _set_input_value(self, element, text: str, field_name: str = "field") -> bool:
+        """Fill an input in one execute_script call (no per-key typing or delays)."""
+        try:
+            self.driver.execute_script(SET_INPUT_VALUE_JS, element, text)
+            value = element.get_attribute("value")
+            if value:
+                logger.info(f"✓ Entered {len(value)} characters into {field_name} via native setter")
+                return True
+            logger.warning(f"Native setter left {field_name} empty, falling back to typing")
+        except Exception as e:
+            logger.warning(f"Native setter failed for {field_name}: {e}. Falling back to typing")
+        return self._type_slowly(element, text, field_name)
+
     def _type_slowly(self, element, text: str, field_name: str = "field"):
         """Type text with multiple fallback methods for React forms."""
         logger.info(f"Attempting to enter text into {field_name}...")
@@ -143,10 +642,9 @@ class LeadfeederScraper:
         try:
             # Method 1: Scroll into view and ensure element is interactable
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.5)
 
-            # Wait for element to be clickable
-            element = WebDriverWait(self.driver, 10).until(
+            # Wait for element to be clickable (returns as soon as it is)
+            element = self._wait(10).until(
                 EC.element_to_be_clickable(element)
             )
 
@@ -181,7 +679,6 @@ class LeadfeederScraper:
             try:
                 # Scroll into view again
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                time.sleep(0.3)
 
                 # Set value with JavaScript
                 self.driver.execute_script("""
@@ -190,9 +687,8 @@ class LeadfeederScraper:
                     arguments[0].dispatchEvent(new Event('input', { bubbles: true }));
                     arguments[0].dispatchEvent(new Event('change', { bubbles: true }));
                 """, element, text)
-                time.sleep(random.uniform(0.5, 1.0))
 
-                # Verify
+                # Verify (the script sets the value synchronously, no need to sleep)
                 value = element.get_attribute("value")
                 if value and len(value) > 0:
                     logger.info(f"✓ Successfully entered {len(value)} characters into {field_name} via JavaScript")
@@ -205,16 +701,120 @@ class LeadfeederScraper:
                 logger.error(f"✗ All methods failed for {field_name}: {js_error}")
                 return False
 
+    def _set_feed_id_from_url(self, current_url: str):
+        """Extract the feed ID from a dashboard URL into self.feed_id."""
+        # Extract feed ID from Dealfront URL (e.g., https://app.dealfront.com/f/296346/...)
+        feed_id_match = _FEED_RE.search(current_url)
+        if feed_id_match:
+            self.feed_id = feed_id_match.group(1)
+            logger.info(f"Detected feed ID: {self.feed_id}")
+        else:
+            # Try old Leadfeeder URL pattern for backwards compatibility
+            old_feed_match = _OLD_FEED_RE.search(current_url)
+            if old_feed_match:
+                self.feed_id = old_feed_match.group(1)
+                logger.info(f"Detected feed ID (old format): {self.feed_id}")
+            else:
+                logger.warning("Could not detect feed ID from URL, using base dashboard URL")
+                self.feed_id = None
+
+    def _save_auth_state(self):
+        """Persist cookies and localStorage after a successful login so later runs can skip it."""
+        try:
+            state = {
+                "saved_at": utc_now(),
+                "cookies": self.driver.get_cookies(),
+                "local_storage": self.driver.execute_script("return JSON.stringify(window.localStorage);"),
+            }
+            path = self.auth_state_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(state), encoding="utf-8")
+            logger.info(f"Saved Leadfeeder session state to {path}")
+        except Exception as e:
+            logger.warning(f"Failed to save Leadfeeder session state: {e}")
+
+    def _restore_auth_state(self) -> bool:
+        """
+        Replay a saved session and check that it still reaches the dashboard.
+
+        Returns:
+            True if the browser is logged in and on a feed URL
+        """
+        path = self.auth_state_path
+        if not path.exists():
+            return False
+        age_hours = (time.time() - path.stat().st_mtime) / 3600
+        if age_hours > Config.LEADFEEDER_AUTH_STATE_MAX_AGE_HOURS:
+            logger.info(f"Saved Leadfeeder session is {age_hours:.0f}h old, logging in again")
+            return False
+
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+
+            # Cookies can only be set for the domain currently loaded
+            self.driver.get(self.LEADFEEDER_DASHBOARD_URL)
+            for cookie in state.get("cookies", []):
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+            if state.get("local_storage"):
+                self.driver.execute_script("""
+                    const items = JSON.parse(arguments[0]);
+                    for (const key of Object.keys(items)) {
+                        window.localStorage.setItem(key, items[key]);
+                    }
+                """, state["local_storage"])
+
+            self.driver.get(self.LEADFEEDER_DASHBOARD_URL)
+            WebDriverWait(self.driver, 10).until(
+                lambda driver: "/f/" in driver.current_url or "/feeds/" in driver.current_url
+            )
+        except TimeoutException:
+            logger.info("Saved Leadfeeder session expired, logging in again")
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to restore Leadfeeder session: {e}")
+            return False
+
+        current_url = self.driver.current_url
+        logger.info(f"Reused saved Leadfeeder session: {current_url}")
+        self._set_feed_id_from_url(current_url)
+        return True
+
     def login(self) -> bool:
-        """Login to Leadfeeder."""
+        """Login to Leadfeeder, reusing a saved session when it is still valid."""
+        if self._restore_auth_state():
+            return True
+
         if not self.email or not self.password:
             logger.error("Leadfeeder credentials not configured")
             return False
 
+        try:
+            return self._login_with_credentials()
+        finally:
+            self._deadline = None
+
+    def _login_with_credentials(self, slow_typing: bool = False) -> bool:
+        """
+        Fill in and submit the login form.
+
+        The fields are set in one step each unless slow_typing is set; the slow,
+        human-paced path is only used as a retry when the fast one looks blocked.
+        """
+        enter_text = self._type_slowly if slow_typing else self._set_input_value
+        # Every wait in this attempt shares one budget, so a hanging step can't stack timeouts
+        self._deadline = time.monotonic() + LOGIN_TIMEOUT_SECONDS
+
         try:
             logger.info("Navigating to Dealfront/Leadfeeder login page...")
             self.driver.get(self.LEADFEEDER_LOGIN_URL)
-            self._human_delay(3, 5)  # Give page time to fully load
+            # The one readiness wait: once the email field is usable the form has rendered
+            logger.info("Waiting for email field to be clickable...")
+            email_field = self._wait(20).until(
+                EC.element_to_be_clickable(EMAIL_INPUT_LOCATOR)
+            )
 
             # Take screenshot of login page
             self._take_screenshot("01_login_page")
@@ -222,43 +822,29 @@ class LeadfeederScraper:
             # Dump page HTML for debugging selectors
             self._dump_page_html("01_login_page")
 
-            # Log all input fields on the page for debugging
-            all_inputs = self.driver.find_elements(By.TAG_NAME, "input")
-            logger.info(f"Found {len(all_inputs)} input elements on the page")
-            for i, inp in enumerate(all_inputs[:10]):  # Log first 10 inputs
-                inp_type = inp.get_attribute("type")
-                inp_name = inp.get_attribute("name")
-                inp_id = inp.get_attribute("id")
-                inp_placeholder = inp.get_attribute("placeholder")
-                logger.info(f"  Input {i+1}: type='{inp_type}', name='{inp_name}', id='{inp_id}', placeholder='{inp_placeholder}'")
-
-            # Wait for email field to be clickable (not just present)
-            logger.info("Waiting for email field to be clickable...")
-            email_field = WebDriverWait(self.driver, 20).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='email'], input[name='email']"))
-            )
+            # Log all input fields on the page for debugging (skipped entirely unless DEBUG)
+            if logger.isEnabledFor(logging.DEBUG):
+                input_count, input_attrs = self.driver.execute_script(DESCRIBE_INPUTS_JS, 10)  # Log first 10 inputs
+                logger.debug(f"Found {input_count} input elements on the page")
+                for i, (inp_type, inp_name, inp_id, inp_placeholder) in enumerate(input_attrs):
+                    logger.debug(f"  Input {i+1}: type='{inp_type}', name='{inp_name}', id='{inp_id}', placeholder='{inp_placeholder}'")
 
             # Log field details for debugging
-            field_id = email_field.get_attribute("id")
-            field_name = email_field.get_attribute("name")
-            field_placeholder = email_field.get_attribute("placeholder")
-            logger.info(f"Email field found - id: '{field_id}', name: '{field_name}', placeholder: '{field_placeholder}'")
-
-            # Wait for password field to be clickable
-            logger.info("Waiting for password field to be clickable...")
-            password_field = WebDriverWait(self.driver, 20).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='password'], input[name='password']"))
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                (field_id, field_name, field_placeholder), = self._describe_elements([email_field], ("id", "name", "placeholder"))
+                logger.debug(f"Email field found - id: '{field_id}', name: '{field_name}', placeholder: '{field_placeholder}'")
+
+            # Rendered together with the email field; only waits if this form splits the steps
+            password_field = self._find_or_wait(PASSWORD_INPUT_LOCATOR, 20)
 
             # Log password field details
-            pwd_id = password_field.get_attribute("id")
-            pwd_name = password_field.get_attribute("name")
-            pwd_placeholder = password_field.get_attribute("placeholder")
-            logger.info(f"Password field found - id: '{pwd_id}', name: '{pwd_name}', placeholder: '{pwd_placeholder}'")
+            if logger.isEnabledFor(logging.DEBUG):
+                (pwd_id, pwd_name, pwd_placeholder), = self._describe_elements([password_field], ("id", "name", "placeholder"))
+                logger.debug(f"Password field found - id: '{pwd_id}', name: '{pwd_name}', placeholder: '{pwd_placeholder}'")
 
             # Enter email with improved method
-            logger.info(f"Entering email: {self.email[:3]}...{self.email[-10:]}")
-            email_success = self._type_slowly(email_field, self.email, "email field")
+            logger.info("Entering email: %s", self._email_masked)
+            email_success = enter_text(email_field, self.email, "email field")
 
             if not email_success:
                 logger.error("Failed to enter email - aborting login")
@@ -267,16 +853,17 @@ class LeadfeederScraper:
 
             # Verify email was entered
             email_value = email_field.get_attribute("value")
-            logger.info(f"Email verification: '{email_value[:3]}...{email_value[-10:] if len(email_value) > 10 else email_value}' (length: {len(email_value)})")
+            logger.info("Email verification: '%s' (length: %d)", _mask_email(email_value), len(email_value))
 
             # Screenshot after email
             self._take_screenshot("02_after_email")
 
-            self._human_delay(0.8, 1.5)  # Pause after email like a human
+            if slow_typing:
+                self._human_delay(0.8, 1.5)  # Pause after email like a human
 
             # Enter password with improved method
             logger.info("Entering password...")
-            password_success = self._type_slowly(password_field, self.password, "password field")
+            password_success = enter_text(password_field, self.password, "password field")
 
             if not password_success:
                 logger.error("Failed to enter password - aborting login")
@@ -290,7 +877,8 @@ class LeadfeederScraper:
             # Screenshot after password
             self._take_screenshot("03_after_password")
 
-            self._human_delay(1, 2)  # Pause before clicking login
+            if slow_typing:
+                self._human_delay(1, 2)  # Pause before clicking login
             logger.info("Credentials entered")
 
             # Find and click login button
@@ -299,57 +887,47 @@ class LeadfeederScraper:
             # Use JavaScript to click to avoid stale element issues
             # The button text changes dynamically to "Logging you in..." which can cause stale element errors
             try:
-                login_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))
-                )
+                login_button = self._find_or_wait(SUBMIT_BUTTON_LOCATOR, 10)
                 button_text = login_button.text
                 logger.info(f"Login button found: '{button_text}'")
 
-                # Small pause before clicking like a human would
-                self._human_delay(0.5, 1)
+                if slow_typing:
+                    # Small pause before clicking like a human would
+                    self._human_delay(0.5, 1)
 
                 # Use JavaScript click to avoid stale element issues
+                old_url = self.driver.current_url
                 self.driver.execute_script("arguments[0].click();", login_button)
                 logger.info("Login button clicked via JavaScript, waiting for redirect...")
             except Exception as e:
                 logger.error(f"Failed to click login button: {e}")
                 raise
 
-            # Wait for dashboard to load
-            self._human_delay(5, 8)
+            # Wait for the redirect to the dashboard instead of a fixed delay
+            self._wait_url_change(old_url)
 
             # Check if login was successful
             current_url = self.driver.current_url
             # Dealfront uses /sign/in, Leadfeeder used /login
-            if "login" not in current_url.lower() and "sign" not in current_url.lower() and "error" not in current_url.lower():
+            if not _LOGIN_FAILED_URL_RE.search(current_url):
                 logger.info(f"Leadfeeder/Dealfront login successful - redirected to: {current_url}")
-
-                # Extract feed ID from Dealfront URL (e.g., https://app.dealfront.com/f/296346/...)
-                feed_id_match = re.search(r'/f/(\d+)', current_url)
-                if feed_id_match:
-                    self.feed_id = feed_id_match.group(1)
-                    logger.info(f"Detected feed ID: {self.feed_id}")
-                else:
-                    # Try old Leadfeeder URL pattern for backwards compatibility
-                    old_feed_match = re.search(r'/feeds/([^/]+)', current_url)
-                    if old_feed_match:
-                        self.feed_id = old_feed_match.group(1)
-                        logger.info(f"Detected feed ID (old format): {self.feed_id}")
-                    else:
-                        logger.warning("Could not detect feed ID from URL, using base dashboard URL")
-                        self.feed_id = None
-
+                self._set_feed_id_from_url(current_url)
+                self._save_auth_state()
                 return True
             else:
+                if not slow_typing and _ANTI_BOT_URL_RE.search(current_url):
+                    logger.warning(f"Possible bot check after fast login ({current_url}), retrying with slow typing")
+                    return self._login_with_credentials(slow_typing=True)
+
                 logger.error(f"Leadfeeder/Dealfront login failed - still on login/sign-in page: {current_url}")
                 # Check for error messages on page
                 try:
                     # Check for various error message patterns
-                    error_messages = self.driver.find_elements(By.CSS_SELECTOR, "[role='alert'], .error, .alert-error, .alert-danger, [class*='error'], [class*='alert']")
+                    error_messages = self.driver.find_elements(*ERROR_MESSAGE_LOCATOR)
                     if error_messages:
                         logger.info(f"Found {len(error_messages)} potential error elements")
-                        for i, msg in enumerate(error_messages):
-                            text = msg.text.strip() if msg.text else ""
+                        for i, (text,) in enumerate(self._describe_elements(error_messages, ("text",))):
+                            text = text.strip()
                             if text:
                                 logger.error(f"Error message {i+1}: {text}")
                     else:
@@ -357,7 +935,7 @@ class LeadfeederScraper:
 
                     # Log page title and a snippet of body text
                     page_title = self.driver.title
-                    body_text = self.driver.find_element(By.TAG_NAME, "body").text[:500]
+                    body_text = self._evaluate(BODY_PREVIEW_JS)
                     logger.info(f"Page title: {page_title}")
                     logger.info(f"Page content preview: {body_text}")
                 except Exception as e:
@@ -375,113 +953,160 @@ class LeadfeederScraper:
             self._dump_page_html("ERROR_exception")
             return False
 
-    def scrape_visitors(self, max_companies: int = 100) -> list:
+    def scrape_visitors(self, max_companies: int = 100, shards: int = 1) -> list:
         """
         Scrape visitor companies from Leadfeeder dashboard.
 
         Args:
             max_companies: Maximum number of companies to scrape
+            shards: Split the date window across this many parallel browsers
+                (capped by MAX_SHARD_DRIVERS and available memory)
 
         Returns:
             List of company dictionaries
         """
-        companies = []
-
         try:
-            # Navigate to visitors/companies page
-            logger.info("Navigating to Dealfront/Leadfeeder visitors page...")
+            visitors_url = self._visitors_url()
+        except Exception as e:
+            logger.error(f"Error scraping visitors: {e}")
+            return []
+
+        if shards > 1:
+            return self._scrape_visitors_sharded(visitors_url, max_companies, shards)
+        return self._scrape_visitors_page(visitors_url, max_companies)
+
+    def _visitors_url(self) -> str:
+        """Build the all-companies URL for the current feed."""
+        # Construct visitors URL with feed ID if available
+        if hasattr(self, 'feed_id') and self.feed_id:
+            # New Dealfront URL structure
+            return f"{self.LEADFEEDER_DASHBOARD_URL}/f/{self.feed_id}/feed/all-companies"
+
+        # Fallback: try to detect current URL structure
+        current_url = self.driver.current_url
+        if '/f/' in current_url:
+            # Dealfront URL: replace page with /feed/all-companies
+            return _FEED_PAGE_RE.sub(lambda m: f"/f/{m.group(0).split('/')[2]}/feed/all-companies", current_url)
+        if '/feeds/' in current_url:
+            # Old Leadfeeder URL
+            return _OLD_FEED_PAGE_RE.sub(lambda m: m.group(0).rsplit('/', 1)[0] + '/visitors', current_url)
+        # Last resort: use base URL (likely won't work without feed ID)
+        return f"{self.LEADFEEDER_DASHBOARD_URL}/feed/all-companies"
+
+    def _scrape_visitors_sharded(self, visitors_url: str, max_companies: int, shards: int) -> list:
+        """
+        Scrape date-range shards of the visitors list in parallel browsers.
 
-            # Construct visitors URL with feed ID if available
-            if hasattr(self, 'feed_id') and self.feed_id:
-                # New Dealfront URL structure
-                visitors_url = f"{self.LEADFEEDER_DASHBOARD_URL}/f/{self.feed_id}/feed/all-companies"
+        Each worker gets its own Chrome profile and reuses the saved session
+        cookies (see _save_auth_state) rather than logging in again.
+        """
+        shards = min(shards, MAX_SHARD_DRIVERS, _max_drivers_for_memory())
+        if shards <= 1:
+            return self._scrape_visitors_page(visitors_url, max_companies)
+
+        now = datetime.now(timezone.utc)
+        days = LEADFEEDER_RETENTION_DAYS
+        shard_urls = []
+        for i in range(shards):
+            start = now - timedelta(days=days * (i + 1) / shards)
+            end = now - timedelta(days=days * i / shards)
+            shard_urls.append(f"{visitors_url}?from={start.strftime('%Y-%m-%d')}&to={end.strftime('%Y-%m-%d')}")
+
+        logger.info(f"Scraping visitors in {shards} parallel shards")
+        with ThreadPoolExecutor(max_workers=shards) as pool:
+            results = pool.map(
+                lambda args: self._scrape_shard(*args, max_companies),
+                enumerate(shard_urls)
+            )
+            companies = [company for shard_companies in results for company in shard_companies]
+
+        return companies[:max_companies]
+
+    def _scrape_shard(self, shard_index: int, shard_url: str, max_companies: int) -> list:
+        """Worker for _scrape_visitors_sharded: one browser, one shard URL."""
+        worker = LeadfeederScraper(self.email, self.password)
+        worker.shard_tag = f"s{shard_index}"
+        healthy = False
+        try:
+            worker.acquire_driver(headless=True)
+            if not worker._restore_auth_state():
+                logger.warning(f"Shard {shard_index}: no reusable session, skipping {shard_url}")
+                return []
+            companies = worker._scrape_visitors_page(shard_url, max_companies)
+            healthy = True
+            return companies
+        except Exception as e:
+            logger.error(f"Shard {shard_index} failed: {e}")
+            return []
+        finally:
+            # Only a browser that just completed a scrape goes back to the pool
+            if healthy:
+                worker.release()
             else:
-                # Fallback: try to detect current URL structure
-                current_url = self.driver.current_url
-                if '/f/' in current_url:
-                    # Dealfront URL: replace page with /feed/all-companies
-                    visitors_url = re.sub(r'/f/\d+/[^?]*', lambda m: f"/f/{m.group(0).split('/')[2]}/feed/all-companies", current_url)
-                elif '/feeds/' in current_url:
-                    # Old Leadfeeder URL
-                    visitors_url = re.sub(r'/feeds/[^/]+/[^/?]*', lambda m: m.group(0).rsplit('/', 1)[0] + '/visitors', current_url)
-                else:
-                    # Last resort: use base URL (likely won't work without feed ID)
-                    visitors_url = f"{self.LEADFEEDER_DASHBOARD_URL}/feed/all-companies"
+                worker.close()
+
+    def _scrape_visitors_page(self, visitors_url: str, max_companies: int) -> list:
+        """Load one visitors list URL, scroll it, and parse the companies on it."""
+        companies = []
 
+        try:
+            # Navigate to visitors/companies page
             logger.info(f"Navigating to: {visitors_url}")
             self.driver.get(visitors_url)
-            self._human_delay(3, 5)
+            try:
+                WebDriverWait(self.driver, 15).until(
+                    EC.presence_of_element_located(COMPANY_LIST_READY_LOCATOR)
+                )
+            except TimeoutException:
+                logger.warning("No company elements rendered within 15s, continuing anyway")
 
             # Take screenshot before scrolling
             self._take_screenshot("04_companies_page_before_scroll")
 
             # Scroll to load more companies (lazy loading)
-            self._scroll_and_load(max_companies)
+            scrolled_fields = self._scroll_and_load(max_companies)
 
             # Take screenshot after scrolling
             self._take_screenshot("05_companies_page_after_scroll")
 
+            # Prefer the JSON the dashboard fetched for itself; DOM parsing is the fallback
+            companies = self._capture_api_companies(max_companies)
+            if companies:
+                logger.info(f"Scraped {len(companies)} companies from Dealfront API responses")
+                return companies
+
             # Try multiple selector strategies to handle Leadfeeder UI changes
-            selector_strategies = [
-                # Card-based layout selectors (current Leadfeeder UI)
-                "[role='button'][class*='company']",  # Clickable company cards
-                "div[class*='CompanyCard']",  # Company card divs
-                "div[class*='company-item']",  # Company item divs
-                "div[class*='CompanyListItem']",  # List item pattern
-                "article",  # Semantic article elements
-                "li[class*='company']",  # List items with company class
-                "div[role='button']",  # Generic clickable divs (very broad)
-                # Table-based selectors (older UI)
-                "table tbody tr",  # Generic table rows
-                "[role='row']",  # ARIA table rows
-                ".MuiTableRow-root",  # Material UI table rows
-                # Original selectors
-                "[data-testid='company-row'], .company-row, .visitor-row",
-                "tr[class*='company'], tr[class*='visitor']",
-                # Alternative selectors
-                ".leads-list-item, .lead-item",
-                "[class*='LeadRow'], [class*='CompanyRow']",
-                # Very generic fallback
-                "ul > li",  # Any list items
-                "div[class*='list'] > div[class*='item']"
-            ]
-
-            company_elements = []
-            for selector in selector_strategies:
-                company_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if company_elements:
-                    logger.info(f"Found {len(company_elements)} elements using selector: {selector}")
-                    break
-
-            if not company_elements:
+            # All strategies are probed in one round-trip, in priority order
+            # Cards extracted while scrolling are skipped; only the rest are read now
+            selector, card_count, card_fields = self.driver.execute_script(
+                FIND_CARDS_JS, COMPANY_CARD_SELECTORS, COMPANY_FIELD_SELECTORS,
+                max_companies - len(scrolled_fields)
+            )
+            card_fields = scrolled_fields + card_fields
+            if card_count:
+                logger.info(f"Found {card_count} elements using selector: {selector}")
+
+            if not card_count:
                 # Debug: Log page source to understand structure
                 logger.warning("No company elements found with any selector")
                 try:
-                    page_text = self.driver.find_element(By.TAG_NAME, "body").text[:500]
+                    page_text = self._evaluate(BODY_PREVIEW_JS)
                     logger.warning(f"Page content preview: {page_text}")
 
-                    # Try to find any clickable elements to understand structure
-                    all_buttons = self.driver.find_elements(By.CSS_SELECTOR, "[role='button']")
-                    logger.warning(f"Found {len(all_buttons)} clickable elements on page")
+                    # Count clickable elements and describe the first few, in one call
+                    button_count, button_attrs = self._evaluate(DESCRIBE_BUTTONS_JS)
+                    logger.warning(f"Found {button_count} clickable elements on page")
 
                     # Log some element classes for debugging
-                    if all_buttons:
-                        for i, btn in enumerate(all_buttons[:5]):
-                            classes = btn.get_attribute("class")
-                            text = btn.text[:50] if btn.text else "(no text)"
-                            logger.warning(f"Button {i}: class='{classes}' text='{text}'")
+                    for i, (classes, text) in enumerate(button_attrs):
+                        text = text[:50] if text else "(no text)"
+                        logger.warning(f"Button {i}: class='{classes}' text='{text}'")
                 except Exception as debug_error:
                     logger.warning(f"Failed to retrieve debug info: {debug_error}")
 
-            logger.info(f"Found {len(company_elements)} company elements total")
+            logger.info(f"Found {card_count} company elements total")
 
-            for idx, element in enumerate(company_elements[:max_companies]):
-                try:
-                    company = self._parse_company_element(element, idx)
-                    if company:
-                        companies.append(company)
-                except Exception as e:
-                    logger.debug(f"Failed to parse company element {idx}: {e}")
+            companies = self._companies_from_card_fields(card_fields)
 
             logger.info(f"Scraped {len(companies)} companies from Leadfeeder")
 
@@ -490,58 +1115,152 @@ class LeadfeederScraper:
 
         return companies
 
-    def _scroll_and_load(self, target_count: int):
-        """Scroll to load more companies via lazy loading."""
+    def _capture_api_companies(self, max_companies: int) -> list:
+        """
+        Build companies from the dashboard's company-list API responses.
+
+        Reads Network.responseReceived events from the performance log and
+        fetches matching bodies with Network.getResponseBody. Returns an empty
+        list when no such response was seen, so callers can fall back to the DOM.
+        """
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {e}")
+            return []
+
+        scraped_on = datetime.now().strftime('%Y%m%d')
+        companies = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message.get("params", {})
+            response = params.get("response", {})
+            if "json" not in response.get("mimeType", "") or not _COMPANIES_API_RE.search(response.get("url", "")):
+                continue
+
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                raw = base64.b64decode(body["body"]) if body.get("base64Encoded") else body["body"]
+                payload = json.loads(raw)
+            except Exception as e:
+                logger.debug(f"Could not read API response {response.get('url')}: {e}")
+                continue
+
+            for record in self._api_records(payload):
+                company = self._company_from_api_record(record, len(companies), scraped_on)
+                if company:
+                    companies.append(company)
+                    if len(companies) >= max_companies:
+                        return companies
+
+        return companies
+
+    def _api_records(self, payload) -> list:
+        """Find the list of company records in an API payload (top-level list or the first list of objects)."""
+        if isinstance(payload, list):
+            return [item for item in payload if isinstance(item, dict)]
+        if isinstance(payload, dict):
+            for key in ("data", "companies", "results", "items", "records"):
+                value = payload.get(key)
+                if isinstance(value, list):
+                    return [item for item in value if isinstance(item, dict)]
+                if isinstance(value, dict):
+                    nested = self._api_records(value)
+                    if nested:
+                        return nested
+        return []
+
+    def _company_from_api_record(self, record: dict, index: int, scraped_on: str) -> Optional[LeadfeederCompany]:
+        """Map one API record onto the same LeadfeederCompany _company_from_fields builds."""
+        attributes = record.get("attributes") if isinstance(record.get("attributes"), dict) else record
+
+        def first(field):
+            for key in API_FIELD_KEYS[field]:
+                value = attributes.get(key)
+                if isinstance(value, dict):
+                    value = value.get("name") or value.get("value")
+                if value not in (None, ""):
+                    return value
+            return None
+
+        location = attributes.get("location")
+        country = first("country")
+        if country is None and isinstance(location, dict):
+            country = location.get("country") or location.get("country_name")
+
+        domain = first("domain")
+        employees = first("employees")
+        views = first("views")
+        record_id = record.get("id")
+
+        company = LeadfeederCompany(
+            leadfeeder_id=f"lf_{record_id}" if record_id else self._fallback_id(index, scraped_on),
+            company_name=first("name"),
+            domain=self._clean_domain(str(domain)) if domain else None,
+            industry=first("industry"),
+            employee_count=self._parse_employee_count(str(employees)) if employees is not None else None,
+            country=country,
+            page_views=self._parse_number(str(views)) if views is not None else None,
+            last_visit_at=first("last_visit"),
+        )
+
+        # Only return if we got at least a name or domain
+        if company.company_name or company.domain:
+            return company
+        return None
+
+    def _scroll_and_load(self, target_count: int) -> list:
+        """
+        Scroll to load more companies via lazy loading.
+
+        Cards are extracted as they render, so parsing overlaps the waits for
+        the next batch and cards a virtualized list drops are still kept.
+
+        Returns:
+            Raw card fields (EXTRACT_CARDS_JS format) for up to target_count cards
+        """
         logger.info(f"Starting scroll to load up to {target_count} companies...")
 
         # Find the scrollable container (Dealfront uses a specific scrollable div)
         try:
             # Try to find the main scrollable content area
-            scrollable_containers = self.driver.find_elements(By.CSS_SELECTOR,
-                "[class*='scroll'], main, [role='main'], .main-content")
+            container_count = self.driver.execute_script(
+                "return document.querySelectorAll(arguments[0]).length;",
+                "[class*='scroll'], main, [role='main'], .main-content"
+            )
 
-            if scrollable_containers:
-                logger.info(f"Found {len(scrollable_containers)} potential scrollable containers")
+            if container_count:
+                logger.info(f"Found {container_count} potential scrollable containers")
         except:
             pass
 
         last_count = 0
+        loaded_count = 0
+        scrolled_fields = []
         scroll_attempts = 0
         max_scroll_attempts = 15
 
-        while scroll_attempts < max_scroll_attempts:
-            # Scroll down using multiple methods
-            # Method 1: Scroll the main window
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-            # Method 2: Scroll within the main content area
-            self.driver.execute_script("""
-                const main = document.querySelector('main') || document.querySelector('[role="main"]');
-                if (main) {
-                    main.scrollTop = main.scrollHeight;
-                }
-            """)
-
-            # Method 3: Scroll the last company element into view to trigger lazy loading
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, "article")
-                if elements:
-                    last_element = elements[-1]
-                    self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'end'});", last_element)
-            except:
-                pass
-
-            # Wait for lazy loading
-            self._human_delay(3, 4)  # Longer delay for lazy loading
+        # First scroll; later ones are issued by the scan at the end of each iteration
+        try:
+            self._evaluate(SCROLL_PAGE_JS)
+        except Exception:
+            pass
 
-            # Count loaded elements
-            elements = []
-            for selector in ["article", "[role='button'][class*='company']", "div[class*='CompanyCard']"]:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    break
+        while scroll_attempts < max_scroll_attempts:
+            # Wait for lazy loading to settle instead of a fixed delay
+            self._wait_for_page_settle()
 
-            loaded_count = len(elements)
+            # Count loaded elements, extract new ones, and scroll again, in one round-trip
+            loaded_count, new_fields = self.driver.execute_script(
+                SCROLL_SCAN_JS, SCROLL_COUNT_SELECTORS, COMPANY_CARD_SELECTORS,
+                COMPANY_FIELD_SELECTORS, max(0, target_count - len(scrolled_fields)), True
+            )
+            scrolled_fields.extend(new_fields)
             logger.info(f"Scroll attempt {scroll_attempts + 1}: Found {loaded_count} company elements")
 
             # If count hasn't changed in 3 attempts, we've loaded everything
@@ -560,123 +1279,86 @@ class LeadfeederScraper:
         logger.info(f"Scrolling complete. Final count: {loaded_count} companies")
 
         # Scroll back to top
-        self.driver.execute_script("window.scrollTo(0, 0);")
-        self._human_delay(1, 2)
-
-    def _parse_company_element(self, element, index: int) -> dict:
-        """Parse a company element into a structured dict."""
-        company = {
-            "leadfeeder_id": f"lf_{index}_{datetime.now().strftime('%Y%m%d')}",
-            "company_name": None,
-            "domain": None,
-            "industry": None,
-            "employee_count": None,
-            "country": None,
-            "page_views": None,
-            "visit_duration": None,
-            "first_visit_at": None,
-            "last_visit_at": None,
-            "pages_visited": [],
-            "referrer": None
-        }
+        self._evaluate("window.scrollTo(0, 0);")
+        self._wait_for_page_settle(timeout=2)
+
+        return scrolled_fields
+
+    def _wait_for_page_settle(self, timeout: float = 4, stable_for: float = 0.3, poll: float = 0.1):
+        """
+        Wait until the document is loaded, no fetch/XHR is in flight, and its
+        scroll height stops changing.
 
+        Returns after that state has held for stable_for seconds, or after
+        timeout (the old fixed delay) if content keeps arriving.
+        """
+        deadline = time.monotonic() + timeout
+        last_state = None
+        stable_since = time.monotonic()
+        while time.monotonic() < deadline:
+            try:
+                ready_state, inflight, *heights = self._evaluate(PAGE_LOAD_STATE_JS)
+            except Exception:
+                break
+            now = time.monotonic()
+            if ready_state != "complete" or inflight or heights != last_state:
+                last_state = heights
+                stable_since = now
+            elif now - stable_since >= stable_for:
+                return
+            time.sleep(poll)
+
+    def _parse_company_elements(self, elements: list) -> list:
+        """Parse company card elements in one execute_script call; unparseable cards are dropped."""
+        if not elements:
+            return []
         try:
-            # Try to get company name
-            name_selectors = [
-                ".company-name", ".lead-name", "[class*='CompanyName']",
-                "h3", "h4", ".name", "[data-testid='company-name']"
-            ]
-            for selector in name_selectors:
-                try:
-                    name_el = element.find_element(By.CSS_SELECTOR, selector)
-                    company["company_name"] = name_el.text.strip()
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Try to get domain
-            domain_selectors = [
-                ".company-domain", ".domain", "[class*='Domain']",
-                "a[href*='http']", ".website"
-            ]
-            for selector in domain_selectors:
-                try:
-                    domain_el = element.find_element(By.CSS_SELECTOR, selector)
-                    domain_text = domain_el.text.strip() or domain_el.get_attribute("href")
-                    if domain_text:
-                        company["domain"] = self._clean_domain(domain_text)
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Try to get visit count/page views
-            view_selectors = [
-                ".page-views", ".visits", "[class*='PageView']",
-                "[class*='visits']", ".visit-count"
-            ]
-            for selector in view_selectors:
-                try:
-                    views_el = element.find_element(By.CSS_SELECTOR, selector)
-                    views_text = views_el.text.strip()
-                    company["page_views"] = self._parse_number(views_text)
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Try to get last visit time
-            time_selectors = [
-                ".last-visit", ".time", "[class*='Time']",
-                ".visit-time", ".timestamp"
-            ]
-            for selector in time_selectors:
-                try:
-                    time_el = element.find_element(By.CSS_SELECTOR, selector)
-                    company["last_visit_at"] = self._parse_relative_time(time_el.text.strip())
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Try to get industry
-            industry_selectors = [
-                ".industry", "[class*='Industry']", ".sector"
-            ]
-            for selector in industry_selectors:
-                try:
-                    industry_el = element.find_element(By.CSS_SELECTOR, selector)
-                    company["industry"] = industry_el.text.strip()
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Try to get employee count
-            employee_selectors = [
-                ".employees", "[class*='Employee']", ".company-size"
-            ]
-            for selector in employee_selectors:
-                try:
-                    emp_el = element.find_element(By.CSS_SELECTOR, selector)
-                    company["employee_count"] = self._parse_employee_count(emp_el.text.strip())
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Try to get country
-            country_selectors = [
-                ".country", "[class*='Country']", ".location"
-            ]
-            for selector in country_selectors:
-                try:
-                    country_el = element.find_element(By.CSS_SELECTOR, selector)
-                    company["country"] = country_el.text.strip()
-                    break
-                except NoSuchElementException:
-                    continue
+            card_fields = self.driver.execute_script(EXTRACT_CARDS_JS, elements, COMPANY_FIELD_SELECTORS)
+        except Exception as e:
+            logger.warning(f"Failed to extract company cards: {e}")
+            return []
+        return self._companies_from_card_fields(card_fields)
 
+    def _companies_from_card_fields(self, card_fields: list) -> list:
+        """Turn EXTRACT_CARDS_JS / FIND_CARDS_JS output into LeadfeederCompany objects."""
+        scraped_on = datetime.now().strftime('%Y%m%d')
+        companies = []
+        for idx, fields in enumerate(card_fields):
+            company = self._company_from_fields(fields or {}, idx, scraped_on)
+            if company:
+                companies.append(company)
+        return companies
+
+    def _fallback_id(self, index: int, scraped_on: str) -> str:
+        """Position-based leadfeeder_id for cards without a stable ID."""
+        if self.shard_tag:
+            return f"lf_{index}_{scraped_on}_{self.shard_tag}"
+        return f"lf_{index}_{scraped_on}"
+
+    def _company_from_fields(self, fields: dict, index: int, scraped_on: str) -> Optional[LeadfeederCompany]:
+        """Build a LeadfeederCompany from the raw card texts returned by EXTRACT_CARDS_JS."""
+        company = LeadfeederCompany(leadfeeder_id=self._fallback_id(index, scraped_on))
+
+        try:
+            if fields.get("name") is not None:
+                company.company_name = fields["name"]
+            if fields.get("domain"):
+                company.domain = self._clean_domain(fields["domain"])
+            if fields.get("views") is not None:
+                company.page_views = self._parse_number(fields["views"])
+            if fields.get("time") is not None:
+                company.last_visit_at = self._parse_relative_time(fields["time"])
+            if fields.get("industry") is not None:
+                company.industry = fields["industry"]
+            if fields.get("employees") is not None:
+                company.employee_count = self._parse_employee_count(fields["employees"])
+            if fields.get("country") is not None:
+                company.country = fields["country"]
         except Exception as e:
             logger.debug(f"Error parsing company element: {e}")
 
         # Only return if we got at least a name or domain
-        if company["company_name"] or company["domain"]:
+        if company.company_name or company.domain:
             return company
         return None
 
@@ -685,14 +1367,11 @@ class LeadfeederScraper:
         if not domain_text:
             return None
 
-        # Remove protocol
-        domain = domain_text.replace("https://", "").replace("http://", "")
-        # Remove path
-        domain = domain.split("/")[0]
-        # Remove www
-        if domain.startswith("www."):
-            domain = domain[4:]
+        # Most domains arrive already clean; skip the regex for those
+        if "/" not in domain_text and not domain_text.startswith("www."):
+            return domain_text.lower()
 
+        domain = _DOMAIN_RE.match(domain_text).group(1)
         return domain.lower() if domain else None
 
     def _parse_number(self, text: str) -> int:
@@ -700,22 +1379,13 @@ class LeadfeederScraper:
         if not text:
             return None
 
-        text = text.lower().strip()
-
-        # Remove non-numeric characters except k, m, .
-        multiplier = 1
-        if "k" in text:
-            multiplier = 1000
-            text = text.replace("k", "")
-        elif "m" in text:
-            multiplier = 1000000
-            text = text.replace("m", "")
-
         try:
-            # Extract number
-            match = re.search(r"[\d.]+", text)
+            # Only a suffix attached to the number scales it, so words like
+            # "weeks" or "minutes" no longer multiply the value.
+            match = _NUM_RE.search(text.lower())
             if match:
-                return int(float(match.group()) * multiplier)
+                multiplier = _MULT.get(match.group(2), 1)
+                return int(float(match.group(1)) * multiplier)
         except:
             pass
 
@@ -727,7 +1397,7 @@ class LeadfeederScraper:
             return None
 
         # Try to find range pattern
-        match = re.search(r"(\d+)\s*[-–]\s*(\d+)", text)
+        match = _RANGE_RE.search(text)
         if match:
             # Return midpoint of range
             low, high = int(match.group(1)), int(match.group(2))
@@ -741,28 +1411,20 @@ class LeadfeederScraper:
         if not text:
             return None
 
-        text = text.lower().strip()
+        match = _REL_TIME_RE.search(text.lower())
+        if not match:
+            return None
+
         now = datetime.now(timezone.utc)
+        unit = match.group(2)
+        if unit is None:
+            return now.isoformat()
 
         try:
-            if "just now" in text or "now" in text:
-                return now.isoformat()
-            elif "minute" in text:
-                minutes = self._parse_number(text) or 1
-                return (now - timedelta(minutes=minutes)).isoformat()
-            elif "hour" in text:
-                hours = self._parse_number(text) or 1
-                return (now - timedelta(hours=hours)).isoformat()
-            elif "day" in text:
-                days = self._parse_number(text) or 1
-                return (now - timedelta(days=days)).isoformat()
-            elif "week" in text:
-                weeks = self._parse_number(text) or 1
-                return (now - timedelta(weeks=weeks)).isoformat()
-        except:
-            pass
-
-        return None
+            amount = int(match.group(1) or 1)
+            return (now - timedelta(**{_REL_TIME_UNITS[unit]: amount})).isoformat()
+        except OverflowError:
+            return None
 
     def get_company_details(self, company_element_index: int) -> dict:
         """
@@ -773,136 +1435,327 @@ class LeadfeederScraper:
         # Implementation depends on Leadfeeder's UI structure
         pass
 
+    def session_alive(self) -> bool:
+        """Check whether the open browser is still logged in by loading the dashboard."""
+        if not self.driver:
+            return False
+        try:
+            self.driver.get(self.LEADFEEDER_DASHBOARD_URL)
+            WebDriverWait(self.driver, 10).until(
+                lambda driver: "/f/" in driver.current_url or "/feeds/" in driver.current_url
+            )
+        except TimeoutException:
+            return False
+        self._set_feed_id_from_url(self.driver.current_url)
+        return True
+
+    def acquire_driver(self, headless: bool = True):
+        """Take an idle shard browser from the pool, or start one with its own profile."""
+        try:
+            self.driver, self.profile_dir = _DRIVER_POOL.get_nowait()
+            logger.info("Reusing pooled Chrome driver")
+            return
+        except queue.Empty:
+            pass
+        self.profile_dir = tempfile.mkdtemp(prefix="lf_shard_")
+        self.init_driver(headless=headless, user_data_dir=self.profile_dir)
+
+    def release(self):
+        """Return the browser to the shard pool, or close it if the pool is full."""
+        if not self.driver:
+            return
+        try:
+            _DRIVER_POOL.put_nowait((self.driver, self.profile_dir))
+            self.driver = None
+            self.profile_dir = None
+        except queue.Full:
+            self.close()
+
     def close(self):
         """Close browser."""
         if self.driver:
             self.driver.quit()
+            self.driver = None
             logger.info("Chrome driver closed")
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
 
+def _dump_json(value) -> str:
+    """Serialize value compactly, with orjson when available (same output either way)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
 
-def store_leadfeeder_data(companies: list):
-    """Store scraped Leadfeeder data in the database and sync to visitor_companies."""
+
+def store_leadfeeder_data(companies: list[LeadfeederCompany]):
+    """
+    Store scraped Leadfeeder data in the database and sync to visitor_companies.
+
+    Rows are built and validated first, then written with executemany inside
+    the connection's single transaction. Visits are deduplicated on
+    leadfeeder_id (last one wins), and rows whose data is unchanged only get
+    their scraped_at/expires_at refreshed instead of a full REPLACE.
+    """
     now = utc_now()
     expires_at = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
-    stored_count = 0
-
-    with get_connection() as conn:
-        for company in companies:
-            try:
-                # Generate unique ID if not present
-                leadfeeder_id = company.get("leadfeeder_id") or f"lf_{company.get('domain', '')}_{now}"
-                domain = company.get("domain")
-                company_name = company.get("company_name")
+    visit_data = {}
+    company_candidates = []
 
-                # Store in leadfeeder_visits table
-                conn.execute("""
-                    INSERT OR REPLACE INTO leadfeeder_visits (
-                        leadfeeder_id, company_name, domain, industry,
-                        employee_count, country, page_views, visit_duration,
-                        first_visit_at, last_visit_at, pages_visited,
-                        referrer, scraped_at, expires_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    leadfeeder_id,
-                    company_name,
-                    domain,
-                    company.get("industry"),
-                    company.get("employee_count"),
-                    company.get("country"),
-                    company.get("page_views"),
-                    company.get("visit_duration"),
-                    company.get("first_visit_at"),
-                    company.get("last_visit_at"),
-                    json.dumps(company.get("pages_visited", [])),
-                    company.get("referrer"),
-                    now,
-                    expires_at
-                ))
-
-                # Also sync to visitor_companies table for frontend display
-                if domain and company_name:
-                    # Generate company key from domain
-                    company_key = domain.replace(".", "_").replace("-", "_")
-
-                    # Check if company already exists
-                    existing = conn.execute("""
-                        SELECT company_key, total_visits FROM visitor_companies
-                        WHERE company_key = ? OR domain = ?
-                    """, (company_key, domain)).fetchone()
-
-                    page_views = company.get("page_views") or 1
-                    last_visit = company.get("last_visit_at") or now
-
-                    if existing:
-                        # Update existing record
-                        conn.execute("""
-                            UPDATE visitor_companies
-                            SET company_name = ?, total_visits = total_visits + ?,
-                                last_visit_at = ?, source = 'leadfeeder',
-                                industry = COALESCE(?, industry),
-                                employee_count = COALESCE(?, employee_count),
-                                country = COALESCE(?, country)
-                            WHERE company_key = ?
-                        """, (
-                            company_name, page_views, last_visit,
-                            company.get("industry"), company.get("employee_count"),
-                            company.get("country"), existing["company_key"]
-                        ))
-                    else:
-                        # Insert new record
-                        conn.execute("""
-                            INSERT INTO visitor_companies (
-                                company_key, company_name, domain, source,
-                                industry, employee_count, country,
-                                total_visits, first_visit_at, last_visit_at,
-                                created_at, updated_at
-                            ) VALUES (?, ?, ?, 'leadfeeder', ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            company_key, company_name, domain,
-                            company.get("industry"), company.get("employee_count"),
-                            company.get("country"), page_views,
-                            company.get("first_visit_at") or now, last_visit, now, now
-                        ))
-
-                stored_count += 1
-            except Exception as e:
-                logger.error(f"Failed to store company {company.get('company_name')}: {e}", exc_info=True)
+    for company in companies:
+        try:
+            # Generate unique ID if not present
+            domain = company.domain
+            company_name = company.company_name
+            leadfeeder_id = company.leadfeeder_id or f"lf_{domain or ''}_{now}"
+
+            # Validate here so a malformed company is dropped alone rather than
+            # failing the executemany for the whole batch (this also covers every
+            # field reused for the visitor_companies upsert below)
+            row = tuple(map(sql_value, (
+                leadfeeder_id,
+                company_name,
+                domain,
+                company.industry,
+                company.employee_count,
+                company.country,
+                company.page_views,
+                company.visit_duration,
+                company.first_visit_at,
+                company.last_visit_at,
+                _dump_json(company.pages_visited),
+                company.referrer
+            )))
+            visit_data.pop(leadfeeder_id, None)  # keep the latest position, as REPLACE did
+            visit_data[leadfeeder_id] = row
+
+            # Also sync to visitor_companies table for frontend display
+            if domain and company_name:
+                company_candidates.append(company)
+        except Exception as e:
+            logger.error(f"Failed to store company {company.company_name}: {e}", exc_info=True)
 
+    with get_connection() as conn:
+        ids = list(visit_data)
+        existing_visits = {}
+        chunk_size = 400  # stay well under SQLite's bound-parameter limit
+        for i in range(0, len(ids), chunk_size):
+            id_chunk = ids[i:i + chunk_size]
+            for row in conn.execute(f"""
+                SELECT leadfeeder_id, company_name, domain, industry,
+                       employee_count, country, page_views, visit_duration,
+                       first_visit_at, last_visit_at, pages_visited, referrer
+                FROM leadfeeder_visits
+                WHERE leadfeeder_id IN ({",".join("?" * len(id_chunk))})
+            """, id_chunk):
+                existing_visits[row["leadfeeder_id"]] = tuple(row)
+
+        visit_rows = []
+        refresh_rows = []
+        for leadfeeder_id, data in visit_data.items():
+            if existing_visits.get(leadfeeder_id) == data:
+                refresh_rows.append((now, expires_at, leadfeeder_id))
+            else:
+                visit_rows.append(data + (now, expires_at))
+
+        conn.executemany("""
+            UPDATE leadfeeder_visits SET scraped_at = ?, expires_at = ?
+            WHERE leadfeeder_id = ?
+        """, refresh_rows)
+        conn.executemany("""
+            INSERT OR REPLACE INTO leadfeeder_visits (
+                leadfeeder_id, company_name, domain, industry,
+                employee_count, country, page_views, visit_duration,
+                first_visit_at, last_visit_at, pages_visited,
+                referrer, scraped_at, expires_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, visit_rows)
+
+        # Existing visitor_companies rows, fetched once and keyed by both
+        # company_key and domain (and extended with this batch's new rows)
+        candidate_keys = {}
+        for company in company_candidates:
+            # Generate company key from domain
+            candidate_keys[company.domain] = company.domain.translate(_COMPANY_KEY_TRANS)
+        known_keys = {}
+        domains = list(candidate_keys)
+        half_chunk = chunk_size // 2
+        for i in range(0, len(domains), half_chunk):
+            domain_chunk = domains[i:i + half_chunk]
+            key_chunk = [candidate_keys[d] for d in domain_chunk]
+            placeholders = ",".join("?" * len(domain_chunk))
+            for row in conn.execute(f"""
+                SELECT company_key, domain FROM visitor_companies
+                WHERE company_key IN ({placeholders}) OR domain IN ({placeholders})
+            """, key_chunk + domain_chunk):
+                known_keys[("key", row["company_key"])] = row["company_key"]
+                known_keys.setdefault(("domain", row["domain"]), row["company_key"])
+
+        company_upserts = []
+        for company in company_candidates:
+            domain = company.domain
+            company_key = candidate_keys[domain]
+
+            # Reuse the key of a row already in the table or earlier in this batch
+            company_key = known_keys.get(("key", company_key)) or known_keys.setdefault(("domain", domain), company_key)
+            known_keys[("key", company_key)] = company_key
+
+            company_upserts.append((
+                company_key, company.company_name, domain,
+                company.industry, company.employee_count,
+                company.country, company.page_views or 1,
+                company.first_visit_at or now, company.last_visit_at or now, now, now
+            ))
+
+        # Rows are applied in order, so a company seen twice in one batch is
+        # inserted by the first row and updated by the next.
+        conn.executemany("""
+            INSERT INTO visitor_companies (
+                company_key, company_name, domain, source,
+                industry, employee_count, country,
+                total_visits, first_visit_at, last_visit_at,
+                created_at, updated_at
+            ) VALUES (?, ?, ?, 'leadfeeder', ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(company_key) DO UPDATE SET
+                company_name = excluded.company_name,
+                total_visits = visitor_companies.total_visits + excluded.total_visits,
+                last_visit_at = excluded.last_visit_at,
+                source = 'leadfeeder',
+                industry = COALESCE(excluded.industry, visitor_companies.industry),
+                employee_count = COALESCE(excluded.employee_count, visitor_companies.employee_count),
+                country = COALESCE(excluded.country, visitor_companies.country),
+                updated_at = excluded.updated_at
+        """, company_upserts)
+
+    stored_count = len(visit_rows) + len(refresh_rows)
     logger.info(f"Stored {stored_count} companies from Leadfeeder and synced to visitor_companies")
     return stored_count
 
 
+# One browser is kept open between scheduled scrapes and recycled every
+# MAX_SCRAPER_RUNS runs (or after a WebDriver error) to bound Chrome's memory growth.
+MAX_SCRAPER_RUNS = 100
+_SCRAPER_SINGLETON: Optional[LeadfeederScraper] = None
+_SCRAPER_RUNS = 0
+_SCRAPER_LOCK = threading.Lock()
+
+
+def _get_or_create_scraper() -> LeadfeederScraper:
+    """Return the shared scraper, starting its browser on first use. Caller holds _SCRAPER_LOCK."""
+    import platform
+
+    global _SCRAPER_SINGLETON
+    if _SCRAPER_SINGLETON is None or _SCRAPER_SINGLETON.driver is None:
+        scraper = LeadfeederScraper()
+        # On Windows, show browser; on Linux, use headless by default
+        is_windows = platform.system() == "Windows"
+        scraper.init_driver(headless=not is_windows)
+        _SCRAPER_SINGLETON = scraper
+    return _SCRAPER_SINGLETON
+
+
+def _reset_scraper():
+    """Quit the shared browser so the next scrape starts a fresh one. Caller holds _SCRAPER_LOCK."""
+    global _SCRAPER_SINGLETON, _SCRAPER_RUNS
+    if _SCRAPER_SINGLETON is not None:
+        try:
+            _SCRAPER_SINGLETON.close()
+        except Exception as e:
+            logger.warning(f"Failed to close Chrome driver: {e}")
+    _SCRAPER_SINGLETON = None
+    _SCRAPER_RUNS = 0
+
+
+@atexit.register
+def _shutdown_browsers():
+    """Quit the shared and pooled browsers so no Chrome outlives the process."""
+    # Don't hang interpreter exit behind a scrape still running in a daemon thread
+    if _SCRAPER_LOCK.acquire(timeout=5):
+        try:
+            _reset_scraper()
+        finally:
+            _SCRAPER_LOCK.release()
+    _drain_driver_pool()
+
+
 def scrape_leadfeeder():
     """
     Main function to scrape Leadfeeder data.
 
-    This should be called by the scheduler before data expires.
+    This should be called by the scheduler before data expires. The browser
+    and its logged-in session are reused across calls.
     """
-    import platform
+    with _SCRAPER_LOCK:
+        return _scrape_leadfeeder_locked()
+
+
+def scrape_many(credentials: list, workers: int = 4, max_companies: int = 100) -> dict:
+    """
+    Scrape several Leadfeeder accounts concurrently, one browser per account.
+
+    Args:
+        credentials: (email, password) pairs
+        workers: Maximum concurrent browsers (also capped by available memory)
+        max_companies: Per-account company limit
+
+    Returns:
+        Dict keyed by email with the same shape scrape_leadfeeder returns
+    """
+    def scrape_account(email: str, password: str) -> list:
+        scraper = LeadfeederScraper(email, password)
+        try:
+            scraper.init_driver(headless=True)
+            if not scraper.login():
+                raise RuntimeError("login_failed")
+            return scraper.scrape_visitors(max_companies=max_companies)
+        finally:
+            scraper.close()
+
+    results = {}
+    if not credentials:
+        return results
+
+    workers = max(1, min(workers, len(credentials), _max_drivers_for_memory()))
+    logger.info(f"Scraping {len(credentials)} Leadfeeder accounts with {workers} browsers")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {email: pool.submit(scrape_account, email, password) for email, password in credentials}
+
+        # Stored from this thread, one account at a time, so SQLite sees a single writer
+        for email, future in futures.items():
+            try:
+                companies = future.result()
+                results[email] = {
+                    "success": True,
+                    "companies_scraped": len(companies),
+                    "companies_stored": store_leadfeeder_data(companies)
+                }
+            except Exception as e:
+                logger.error(f"Leadfeeder scrape failed for {email}: {e}")
+                results[email] = {"success": False, "error": str(e), "companies_scraped": 0}
+
+    return results
+
+
+def _scrape_leadfeeder_locked():
+    global _SCRAPER_RUNS
 
     logger.info("Starting Leadfeeder scrape...")
 
-    scraper = LeadfeederScraper()
+    # Written to integration_status once, in finally; None leaves the row untouched
+    final_status = None
+    final_error = None
 
     try:
-        # On Windows, show browser; on Linux, use headless by default
-        is_windows = platform.system() == "Windows"
-        scraper.init_driver(headless=not is_windows)
+        scraper = _get_or_create_scraper()
 
-        if not scraper.login():
+        if not scraper.session_alive() and not scraper.login():
             logger.error("Failed to login to Leadfeeder")
             return {"success": False, "error": "login_failed", "companies_scraped": 0}
 
         companies = scraper.scrape_visitors(max_companies=100)
         stored_count = store_leadfeeder_data(companies)
-
-        # Update integration status
-        with get_connection() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO integration_status
-                (integration_name, status, last_sync_at, error_message, config_valid)
-                VALUES (?, ?, ?, ?, ?)
-            """, ("leadfeeder", "active", utc_now(), None, 1))
+        final_status = "active"
 
         return {
             "success": True,
@@ -912,19 +1765,27 @@ def scrape_leadfeeder():
 
     except Exception as e:
         logger.error(f"Leadfeeder scrape failed: {e}")
+        final_status = "error"
+        final_error = str(e)
 
-        # Update integration status with error
-        with get_connection() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO integration_status
-                (integration_name, status, last_sync_at, error_message, config_valid)
-                VALUES (?, ?, ?, ?, ?)
-            """, ("leadfeeder", "error", utc_now(), str(e), 0))
+        if isinstance(e, WebDriverException):
+            _reset_scraper()
 
         return {"success": False, "error": str(e), "companies_scraped": 0}
 
     finally:
-        scraper.close()
+        if final_status:
+            with get_connection() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO integration_status
+                    (integration_name, status, last_sync_at, error_message, config_valid)
+                    VALUES (?, ?, ?, ?, ?)
+                """, ("leadfeeder", final_status, utc_now(), final_error, int(final_status == "active")))
+
+        _SCRAPER_RUNS += 1
+        if _SCRAPER_RUNS >= MAX_SCRAPER_RUNS:
+            logger.info(f"Recycling Chrome driver after {_SCRAPER_RUNS} scrapes")
+            _reset_scraper()
 
 
 def get_leadfeeder_status() -> dict:
@@ -934,16 +1795,15 @@ def get_leadfeeder_status() -> dict:
             SELECT * FROM integration_status WHERE integration_name = 'leadfeeder'
         """).fetchone()
 
-        company_count = conn.execute("""
-            SELECT COUNT(*) as count FROM leadfeeder_visits
-            WHERE expires_at > datetime('now')
-        """).fetchone()["count"]
-
-        expiring_soon = conn.execute("""
-            SELECT COUNT(*) as count FROM leadfeeder_visits
+        # One range scan of idx_leadfeeder_visits_expires answers both counts
+        counts = conn.execute("""
+            SELECT COUNT(*) as active,
+                   COUNT(CASE WHEN expires_at < datetime('now', '+2 days') THEN 1 END) as expiring
+            FROM leadfeeder_visits
             WHERE expires_at > datetime('now')
-            AND expires_at < datetime('now', '+2 days')
-        """).fetchone()["count"]
+        """).fetchone()
+        company_count = counts["active"]
+        expiring_soon = counts["expiring"]
 
     return {
         "configured": bool(Config.LEADFEEDER_EMAIL and Config.LEADFEEDER_PASSWORD),
@@ -3,7 +3,9 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+import atexit
+import threading
 import time
 import random
 from config import Config
@@ -32,6 +34,12 @@ class LinkedInAutomation:
             'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
         })
 
+    def _type(self, element, text):
+        """Focus element and insert text in one CDP call, then pause as long as typing would."""
+        element.click()
+        self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        time.sleep(random.uniform(len(text) * 0.02, len(text) * 0.05))
+
     def login(self):
         """Login to LinkedIn."""
         try:
@@ -44,16 +52,12 @@ class LinkedInAutomation:
             )
             password_field = self.driver.find_element(By.ID, "password")
 
-            # Type slowly to mimic human behavior
-            for char in self.email:
-                email_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
+            # Pause roughly as long as typing would take to mimic human behavior
+            self._type(email_field, self.email)
 
             time.sleep(random.uniform(0.5, 1))
 
-            for char in self.password:
-                password_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
+            self._type(password_field, self.password)
 
             time.sleep(random.uniform(0.5, 1))
 
@@ -61,8 +65,13 @@ class LinkedInAutomation:
             login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             login_button.click()
 
-            # Wait for login and check if successful
-            time.sleep(5)
+            # Wait until LinkedIn redirects to the feed or a security check
+            try:
+                WebDriverWait(self.driver, 10).until(
+                    lambda d: any(marker in d.current_url for marker in ("feed", "mynetwork", "checkpoint"))
+                )
+            except TimeoutException:
+                pass
 
             # Check if we're on the feed (successful login)
             if "feed" in self.driver.current_url or "mynetwork" in self.driver.current_url:
@@ -108,10 +117,7 @@ class LinkedInAutomation:
                             EC.presence_of_element_located((By.ID, "custom-message"))
                         )
 
-                        # Type message slowly
-                        for char in message:
-                            message_field.send_keys(char)
-                            time.sleep(random.uniform(0.03, 0.08))
+                        self._type(message_field, message)
 
                         time.sleep(random.uniform(1, 2))
                     except:
@@ -155,10 +161,7 @@ class LinkedInAutomation:
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".msg-form__contenteditable, .msg-form__textarea"))
             )
 
-            # Type message slowly
-            for char in message:
-                message_box.send_keys(char)
-                time.sleep(random.uniform(0.03, 0.08))
+            self._type(message_box, message)
 
             time.sleep(random.uniform(1, 2))
 
@@ -177,78 +180,114 @@ class LinkedInAutomation:
         """Close browser."""
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
 
-# Wrapper functions for sequence_engine.py
-def send_connection_request(profile_url, message=""):
-    """Send LinkedIn connection request."""
-    linkedin_email = getattr(Config, 'LINKEDIN_EMAIL', None)
-    linkedin_password = getattr(Config, 'LINKEDIN_PASSWORD', None)
+# One logged-in browser is shared by the wrapper functions and reused for up
+# to LINKEDIN_SESSION_TTL_SECONDS after its last action, so a sequence run
+# pays for Chrome start-up and login once instead of per action.
+LINKEDIN_SESSION_TTL_SECONDS = 15 * 60
+_LINKEDIN_SESSION = None
+_LINKEDIN_LAST_USED = 0.0
+_LINKEDIN_LOCK = threading.Lock()
 
-    if not linkedin_email or not linkedin_password:
-        raise Exception("LinkedIn credentials not configured in config.py")
 
+def _driver_alive(linkedin):
+    """Return True if the browser behind linkedin still answers WebDriver calls."""
+    try:
+        linkedin.driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+def _reset_linkedin():
+    """Quit the shared browser so the next action logs in again. Caller holds _LINKEDIN_LOCK."""
+    global _LINKEDIN_SESSION
+    if _LINKEDIN_SESSION is not None:
+        try:
+            _LINKEDIN_SESSION.close()
+        except Exception as e:
+            print(f"Failed to close LinkedIn browser: {e}")
+    _LINKEDIN_SESSION = None
+
+
+def _get_linkedin(linkedin_email, linkedin_password):
+    """Return the shared logged-in session, or None if login fails. Caller holds _LINKEDIN_LOCK."""
+    global _LINKEDIN_SESSION
+
+    if (_LINKEDIN_SESSION is not None
+            and time.monotonic() - _LINKEDIN_LAST_USED < LINKEDIN_SESSION_TTL_SECONDS
+            and _driver_alive(_LINKEDIN_SESSION)):
+        return _LINKEDIN_SESSION
+
+    _reset_linkedin()
     linkedin = LinkedInAutomation(
         email=linkedin_email,
         password=linkedin_password
     )
-
     try:
         linkedin.init_driver(headless=True)
-        login_success = linkedin.login()
-
-        if not login_success:
+        if not linkedin.login():
             linkedin.close()
-            return False
-
-        # Random delay before action
-        time.sleep(random.uniform(2, 5))
-
-        success = linkedin.send_connection_request(profile_url, message)
-
-        # Random delay after action
-        time.sleep(random.uniform(2, 4))
-
+            return None
+    except Exception:
         linkedin.close()
-        return success
+        raise
 
-    except Exception as e:
-        print(f"LinkedIn automation error: {e}")
-        linkedin.close()
-        return False
+    _LINKEDIN_SESSION = linkedin
+    return linkedin
 
 
-def send_linkedin_message(profile_url, message):
-    """Send LinkedIn message to connection."""
+def _run_linkedin_action(action, *args):
+    """Run a LinkedInAutomation method on the shared session, dropping the session if the browser died."""
+    global _LINKEDIN_LAST_USED
     linkedin_email = getattr(Config, 'LINKEDIN_EMAIL', None)
     linkedin_password = getattr(Config, 'LINKEDIN_PASSWORD', None)
 
     if not linkedin_email or not linkedin_password:
-        raise Exception("LinkedIn credentials not configured")
+        raise Exception("LinkedIn credentials not configured in config.py")
 
-    linkedin = LinkedInAutomation(
-        email=linkedin_email,
-        password=linkedin_password
-    )
+    with _LINKEDIN_LOCK:
+        try:
+            linkedin = _get_linkedin(linkedin_email, linkedin_password)
+            if linkedin is None:
+                return False
 
-    try:
-        linkedin.init_driver(headless=True)
-        login_success = linkedin.login()
+            # Random delay between actions (the action itself paces its page steps)
+            time.sleep(random.uniform(2, 5))
 
-        if not login_success:
-            linkedin.close()
+            success = action(linkedin, *args)
+
+            if success or _driver_alive(linkedin):
+                _LINKEDIN_LAST_USED = time.monotonic()
+            else:
+                _reset_linkedin()
+            return success
+
+        except Exception as e:
+            print(f"LinkedIn automation error: {e}")
+            _reset_linkedin()
             return False
 
-        time.sleep(random.uniform(2, 5))
 
-        success = linkedin.send_message_to_connection(profile_url, message)
+@atexit.register
+def _shutdown_linkedin():
+    """Quit the shared browser so no Chrome outlives the process."""
+    # Don't hang interpreter exit behind an action still running in another thread
+    if _LINKEDIN_LOCK.acquire(timeout=5):
+        try:
+            _reset_linkedin()
+        finally:
+            _LINKEDIN_LOCK.release()
 
-        time.sleep(random.uniform(2, 4))
 
-        linkedin.close()
-        return success
+# Wrapper functions for sequence_engine.py
+def send_connection_request(profile_url, message=""):
+    """Send LinkedIn connection request."""
+    return _run_linkedin_action(LinkedInAutomation.send_connection_request, profile_url, message)
 
-    except Exception as e:
-        print(f"LinkedIn message error: {e}")
-        linkedin.close()
-        return False
+
+def send_linkedin_message(profile_url, message):
+    """Send LinkedIn message to connection."""
+    return _run_linkedin_action(LinkedInAutomation.send_message_to_connection, profile_url, message)
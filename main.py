@@ -1,13 +1,22 @@
 import argparse
 import hashlib
 import json
+import re
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 import logging
 from config import Config
 from personalization_engine import batch_generate
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -166,6 +175,37 @@ PAIN_LIBRARY_FULL_AUTO = {
 # Legacy alias for backward compatibility
 PAIN_LIBRARY = PAIN_LIBRARY_CONVENTIONAL
 
+PAIN_LIBRARIES = {
+    "conventional": PAIN_LIBRARY_CONVENTIONAL,
+    "semi_auto": PAIN_LIBRARY_SEMI_AUTO,
+    "full_auto": PAIN_LIBRARY_FULL_AUTO
+}
+
+DEFAULT_PAIN_STATEMENT = "Throughput often tightens where storage and picking exchange materials."
+
+
+def _build_pain_indexes() -> tuple[dict, dict]:
+    """
+    Flatten PAIN_LIBRARIES for select_pain_statement.
+
+    Returns ({(strategy, icp, role, theme): statement}, keeping the first entry
+    per theme, and {(strategy, icp, role): first statement}).
+    """
+    by_theme = {}
+    first = {}
+    for strategy, library in PAIN_LIBRARIES.items():
+        for icp_match, roles in library.items():
+            for role_level, entries in roles.items():
+                if not entries:
+                    continue
+                first[(strategy, icp_match, role_level)] = entries[0]["statement"]
+                for entry in entries:
+                    by_theme.setdefault((strategy, icp_match, role_level, entry["theme"]), entry["statement"])
+    return by_theme, first
+
+
+PAIN_STATEMENT_BY_THEME, PAIN_STATEMENT_FIRST = _build_pain_indexes()
+
 PAIN_THEME_KEYWORDS = {
     "throughput": ["throughput", "sortation", "merge", "induction", "shipping", "shipping dock", "case handling"],
     "space": ["cold storage", "density", "deep-lane", "pallet shuttle", "asrs", "vlm", "space", "high-density"],
@@ -186,6 +226,62 @@ EQUIPMENT_ANCHOR_KEYWORDS = {
     "wms": ["wms", "warehouse management"]
 }
 
+# Keyword tables matched by the shared automaton, keyed by group name
+KEYWORD_GROUPS = {
+    "role": ROLE_LEVEL_KEYWORDS,
+    "pain": PAIN_THEME_KEYWORDS,
+    "equipment": EQUIPMENT_ANCHOR_KEYWORDS
+}
+
+
+def _build_keyword_automaton():
+    """Compile every keyword in KEYWORD_GROUPS into one Aho-Corasick automaton, or None."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+
+    # A keyword can belong to several groups ("wms", "automation", ...)
+    payloads = {}
+    for group, categories in KEYWORD_GROUPS.items():
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                payloads.setdefault(keyword, []).append((group, category))
+
+    automaton = ahocorasick.Automaton()
+    for keyword, hits in payloads.items():
+        automaton.add_word(keyword, tuple(hits))
+    automaton.make_automaton()
+    return automaton
+
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Per-category alternations of the same keywords, for keyword_hits without pyahocorasick
+KEYWORD_PATTERNS = {
+    group: {
+        category: re.compile("|".join(map(re.escape, keywords)))
+        for category, keywords in categories.items()
+    }
+    for group, categories in KEYWORD_GROUPS.items()
+}
+
+# Equipment offers in priority order (first offer with a keyword in the lead's equipment wins)
+EQUIPMENT_OFFER_KEYWORDS = {
+    "high_density": ["pallet shuttle", "push-back", "pallet flow", "deep-lane", "pushback"],
+    "conveyor": ["conveyor", "sortation", "case handling"],
+    "racking": ["pick module", "pick", "racking", "shelving", "mezzanine"],
+    "amr_agv": ["amr", "agv", "autonomous", "mobile robot"]
+}
+
+# One anchored match: alternatives are tried in priority order, each a lookahead
+# over the whole text, and the empty named group reports which offer matched.
+EQUIPMENT_OFFER_RE = re.compile(
+    "|".join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))(?P<{offer}>)"
+        for offer, keywords in EQUIPMENT_OFFER_KEYWORDS.items()
+    ),
+    re.DOTALL
+)
+
 CTA_ACTION_VARIANTS = {
     "throughput": [
         "sanity-check the flow",
@@ -273,6 +369,12 @@ CREDIBILITY_TEMPLATES_FULL_AUTO = [
 # Legacy alias for backward compatibility
 CREDIBILITY_TEMPLATES = CREDIBILITY_TEMPLATES_CONVENTIONAL
 
+CREDIBILITY_TEMPLATES_BY_STRATEGY = {
+    "conventional": CREDIBILITY_TEMPLATES_CONVENTIONAL,
+    "semi_auto": CREDIBILITY_TEMPLATES_SEMI_AUTO,
+    "full_auto": CREDIBILITY_TEMPLATES_FULL_AUTO
+}
+
 # Subject line templates - strategy specific
 SUBJECT_TEMPLATES_CONVENTIONAL = {
     "throughput": [
@@ -341,6 +443,12 @@ SUBJECT_TEMPLATES_FULL_AUTO = {
 # Legacy alias for backward compatibility
 SUBJECT_TEMPLATES_BY_THEME = SUBJECT_TEMPLATES_CONVENTIONAL
 
+SUBJECT_TEMPLATES_BY_STRATEGY = {
+    "conventional": SUBJECT_TEMPLATES_CONVENTIONAL,
+    "semi_auto": SUBJECT_TEMPLATES_SEMI_AUTO,
+    "full_auto": SUBJECT_TEMPLATES_FULL_AUTO
+}
+
 SUBJECT_TEMPLATES_BY_ICP = {
     "ICP 1": [
         "Pick module flow",
@@ -401,6 +509,27 @@ REINFORCEMENT_TEMPLATES = {
 }
 
 
+@dataclass(slots=True)
+class LeadContext:
+    """Lowercased lead fields shared by the keyword classifiers, built once per row."""
+
+    title_lower: str
+    industry_lower: str
+    equipment_lower: str
+    combined_lower: str
+
+    @classmethod
+    def from_fields(cls, job_title: str, industry: str, equipment: str, notes: str) -> "LeadContext":
+        """Build from already normalize_text()-ed fields."""
+        equipment_lower = equipment.lower()
+        return cls(
+            title_lower=job_title.lower(),
+            industry_lower=industry.lower(),
+            equipment_lower=equipment_lower,
+            combined_lower=f"{equipment_lower} {notes.lower()}"
+        )
+
+
 def extract_first_name(full_name: str) -> str:
     """
     Extract first name from full name field
@@ -420,11 +549,20 @@ def extract_first_name(full_name: str) -> str:
 
 
 def normalize_text(value) -> str:
+    # Most cells are already strings; only other types need the missing-value check
+    if isinstance(value, str):
+        return value.strip()
     if value is None or pd.isna(value):
         return ""
     return str(value).strip()
 
 
+# A lead list has few distinct industries, and every email line formats one
+@lru_cache(maxsize=256)
+def industry_display_text(industry) -> str:
+    return normalize_text(industry) or "operations"
+
+
 def normalize_strategy(value: str, default: str = "conventional") -> str:
     text = normalize_text(value).lower()
     if text in {"conventional", "semi_auto", "full_auto", "hybrid"}:
@@ -442,12 +580,21 @@ def resolve_email_strategies(row: dict, default_strategy: str) -> tuple[str, str
     return assignment, assignment, assignment
 
 
+# Runs of characters that are not str.isalnum() (\w is alnum plus "_")
+NON_ALNUM_RUN_RE = re.compile(r"[\W_]+")
+
+
+# Seeds, ICP names and equipment categories repeat across leads and across
+# regenerations of the same campaign, and both helpers are pure functions.
+@lru_cache(maxsize=65536)
 def deterministic_index(seed: str, modulo: int) -> int:
     if modulo <= 0:
         return 0
     safe_seed = seed or "default"
-    digest = hashlib.md5(safe_seed.encode("utf-8")).hexdigest()
-    return int(digest[:8], 16) % modulo
+    # First 32 bits of the MD5 digest, read directly rather than via hexdigest();
+    # the hash stays MD5 so existing leads keep their variant assignments.
+    digest = hashlib.md5(safe_seed.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % modulo
 
 
 def deterministic_choice(seed: str, options: list[str], salt: str = "") -> str:
@@ -457,10 +604,9 @@ def deterministic_choice(seed: str, options: list[str], salt: str = "") -> str:
     return options[index]
 
 
+@lru_cache(maxsize=1024)
 def slugify(text: str) -> str:
-    cleaned = "".join(ch.lower() if ch.isalnum() else "-" for ch in text or "")
-    while "--" in cleaned:
-        cleaned = cleaned.replace("--", "-")
+    cleaned = NON_ALNUM_RUN_RE.sub("-", text or "").lower()
     return cleaned.strip("-") or "default"
 
 
@@ -472,32 +618,53 @@ def select_variant(seed: str, options: list[str], variant_key: str, salt: str =
     return variant_id, options[index]
 
 
-def classify_role_level(job_title: str) -> str:
-    title = normalize_text(job_title).lower()
+@lru_cache(maxsize=4096)
+def keyword_hits(text: str) -> frozenset:
+    """
+    Return the (group, category) pairs from KEYWORD_GROUPS whose keywords occur in text.
+
+    Uses one pass of KEYWORD_AUTOMATON when pyahocorasick is installed and
+    falls back to one KEYWORD_PATTERNS regex search per category otherwise.
+    Cached because the equipment and pain classifiers look up the same
+    combined text for each lead.
+    """
+    if KEYWORD_AUTOMATON is not None:
+        return frozenset(hit for _, hits in KEYWORD_AUTOMATON.iter(text) for hit in hits)
+    return frozenset(
+        (group, category)
+        for group, patterns in KEYWORD_PATTERNS.items()
+        for category, pattern in patterns.items()
+        if pattern.search(text)
+    )
+
+
+def classify_role_level(ctx: LeadContext) -> str:
+    title = ctx.title_lower
     if not title:
         return "unknown"
 
-    for level, keywords in ROLE_LEVEL_KEYWORDS.items():
-        if any(keyword in title for keyword in keywords):
+    hits = keyword_hits(title)
+    for level in ROLE_LEVEL_KEYWORDS:
+        if ("role", level) in hits:
             return level
     return "unknown"
 
 
-def extract_equipment_anchors(equipment: str, notes: str) -> list[str]:
-    combined = f"{normalize_text(equipment)} {normalize_text(notes)}".lower()
-    anchors = []
-    for anchor, keywords in EQUIPMENT_ANCHOR_KEYWORDS.items():
-        if any(keyword in combined for keyword in keywords):
-            anchors.append(anchor)
-    return anchors
+def extract_equipment_anchors(ctx: LeadContext) -> list[str]:
+    hits = keyword_hits(ctx.combined_lower)
+    return [anchor for anchor in EQUIPMENT_ANCHOR_KEYWORDS if ("equipment", anchor) in hits]
 
 
-def infer_pain_theme(icp_match: str, role_level: str, equipment: str, notes: str) -> str:
-    combined = f"{normalize_text(equipment)} {normalize_text(notes)}".lower()
-    for theme, keywords in PAIN_THEME_KEYWORDS.items():
-        if any(keyword in combined for keyword in keywords):
+def infer_pain_theme(ctx: LeadContext, icp_match: str, role_level: str) -> str:
+    hits = keyword_hits(ctx.combined_lower)
+    for theme in PAIN_THEME_KEYWORDS:
+        if ("pain", theme) in hits:
             return theme
+    return default_pain_theme(icp_match, role_level)
+
 
+def default_pain_theme(icp_match: str, role_level: str) -> str:
+    """Pain theme used when the lead's equipment and notes mention no theme keyword."""
     icp_entry = PAIN_LIBRARY.get(icp_match, {})
     role_entry = icp_entry.get(role_level) or PAIN_LIBRARY.get("DEFAULT", {}).get("unknown", [])
     if role_entry:
@@ -507,32 +674,17 @@ def infer_pain_theme(icp_match: str, role_level: str, equipment: str, notes: str
 
 def get_pain_library_for_strategy(strategy: str = "conventional") -> dict:
     """Return the appropriate pain library based on campaign strategy"""
-    if strategy == "semi_auto":
-        return PAIN_LIBRARY_SEMI_AUTO
-    elif strategy == "full_auto":
-        return PAIN_LIBRARY_FULL_AUTO
-    else:
-        return PAIN_LIBRARY_CONVENTIONAL
+    return PAIN_LIBRARIES.get(strategy, PAIN_LIBRARY_CONVENTIONAL)
 
 
 def get_subject_templates_for_strategy(strategy: str = "conventional") -> dict:
     """Return the appropriate subject templates based on campaign strategy"""
-    if strategy == "semi_auto":
-        return SUBJECT_TEMPLATES_SEMI_AUTO
-    elif strategy == "full_auto":
-        return SUBJECT_TEMPLATES_FULL_AUTO
-    else:
-        return SUBJECT_TEMPLATES_CONVENTIONAL
+    return SUBJECT_TEMPLATES_BY_STRATEGY.get(strategy, SUBJECT_TEMPLATES_CONVENTIONAL)
 
 
 def get_credibility_templates_for_strategy(strategy: str = "conventional") -> list:
     """Return the appropriate credibility templates based on campaign strategy"""
-    if strategy == "semi_auto":
-        return CREDIBILITY_TEMPLATES_SEMI_AUTO
-    elif strategy == "full_auto":
-        return CREDIBILITY_TEMPLATES_FULL_AUTO
-    else:
-        return CREDIBILITY_TEMPLATES_CONVENTIONAL
+    return CREDIBILITY_TEMPLATES_BY_STRATEGY.get(strategy, CREDIBILITY_TEMPLATES_CONVENTIONAL)
 
 
 def select_pain_statement(icp_match: str, role_level: str, pain_theme: str, strategy: str = "conventional") -> str:
@@ -548,23 +700,23 @@ def select_pain_statement(icp_match: str, role_level: str, pain_theme: str, stra
     Returns:
         Pain statement string
     """
-    pain_library = get_pain_library_for_strategy(strategy)
-    role_entry = pain_library.get(icp_match, {}).get(role_level, [])
-    if not role_entry:
-        role_entry = pain_library.get("DEFAULT", {}).get("unknown", [])
+    if strategy not in PAIN_LIBRARIES:
+        strategy = "conventional"
+    key = (strategy, icp_match, role_level)
+    if key not in PAIN_STATEMENT_FIRST:
+        key = (strategy, "DEFAULT", "unknown")
 
-    for entry in role_entry:
-        if entry["theme"] == pain_theme:
-            return entry["statement"]
+    statement = PAIN_STATEMENT_BY_THEME.get(key + (pain_theme,))
+    if statement is not None:
+        return statement
+    return PAIN_STATEMENT_FIRST.get(key, DEFAULT_PAIN_STATEMENT)
 
-    return role_entry[0]["statement"] if role_entry else "Throughput often tightens where storage and picking exchange materials."
 
-
-def compute_icp_confidence(icp_match: str, industry: str, role_level: str, equipment_anchors: list[str]) -> str:
+def compute_icp_confidence(icp_match: str, ctx: LeadContext, role_level: str, equipment_anchors: list[str]) -> str:
     score = 0
     if icp_match in PAIN_LIBRARY:
         score += 2
-    industry_clean = normalize_text(industry).lower()
+    industry_clean = ctx.industry_lower
     if industry_clean and industry_clean not in ["other", "misc", "general"]:
         score += 1
     if role_level != "unknown":
@@ -623,7 +775,7 @@ def build_cta_line(
         f"cta-template-{pain_theme}-{confidence_key}-{'f' if followup else 'i'}"
     )
 
-    industry_text = normalize_text(industry) or "operations"
+    industry_text = industry_display_text(industry)
     line = template.format(action=action, industry=industry_text)
     cta_variant_id = f"{action_variant_id}-{template_variant_id}"
     return cta_variant_id, action, line
@@ -635,7 +787,7 @@ def build_reinforcement_line(
     icp_confidence: str,
     seed: str
 ) -> tuple[str, str]:
-    industry_text = normalize_text(industry) or "operations"
+    industry_text = industry_display_text(industry)
     if icp_confidence == "high":
         adverb = "almost always"
     elif icp_confidence == "medium":
@@ -657,25 +809,23 @@ def build_reinforcement_line(
     return variant_id, template.format(industry=industry_text, adverb=adverb, detail=detail)
 
 
-def get_equipment_offer(icp_match: str, equipment: str, notes: str) -> tuple[str, str]:
+def get_equipment_offer(ctx: LeadContext, icp_match: str) -> tuple[str, str]:
     """
     Dynamically select equipment offer based on lead context
 
     Args:
+        ctx: Lowercased equipment description and ICP notes for the lead
         icp_match: ICP segment (e.g., "ICP 1", "ICP 2", etc.)
-        equipment: Equipment description from dataset
-        notes: ICP notes with additional context
 
     Returns:
         (equipment_category, software_mention)
     """
-    # Normalize inputs for matching
-    equipment_lower = str(equipment).lower()
-    notes_lower = str(notes).lower()
-    combined_context = f"{equipment_lower} {notes_lower}"
+    combined_context = ctx.combined_lower
+    match = EQUIPMENT_OFFER_RE.match(ctx.equipment_lower)
+    offer = match.lastgroup if match else None
 
     # Priority 1: High-Density Storage Systems
-    if any(keyword in equipment_lower for keyword in ["pallet shuttle", "push-back", "pallet flow", "deep-lane", "pushback"]):
+    if offer == "high_density":
         equipment_category = "high-density storage systems - pallet shuttles, push-back rack, and deep-lane flow"
         if icp_match in ["ICP 2", "ICP 5"]:
             software_mention = " - and we built DensityPro to orchestrate the staging logic that most WMS systems miss"
@@ -684,7 +834,7 @@ def get_equipment_offer(icp_match: str, equipment: str, notes: str) -> tuple[str
         return (equipment_category, software_mention)
 
     # Priority 2: Conveyor & Sortation
-    if any(keyword in equipment_lower for keyword in ["conveyor", "sortation", "case handling"]):
+    if offer == "conveyor":
         equipment_category = "case and pallet conveyor systems with integrated sortation"
         if icp_match == "ICP 4" and "national" in combined_context:
             software_mention = " - and partner with Lully to handle the WMS orchestration that makes throughput targets actually achievable"
@@ -693,7 +843,7 @@ def get_equipment_offer(icp_match: str, equipment: str, notes: str) -> tuple[str
         return (equipment_category, software_mention)
 
     # Priority 3: Pick Module & Racking Systems
-    if any(keyword in equipment_lower for keyword in ["pick module", "pick", "racking", "shelving", "mezzanine"]):
+    if offer == "racking":
         equipment_category = "racking systems and pick modules"
         if icp_match in ["ICP 1", "ICP 3"]:
             software_mention = " - and we've built slotting software (Warehousr) to help you reconfigure layouts as demand changes"
@@ -702,7 +852,7 @@ def get_equipment_offer(icp_match: str, equipment: str, notes: str) -> tuple[str
         return (equipment_category, software_mention)
 
     # Priority 4: AMR/AGV Automation
-    if any(keyword in equipment_lower for keyword in ["amr", "agv", "autonomous", "mobile robot"]):
+    if offer == "amr_agv":
         equipment_category = "AMR and AGV systems for material flow automation"
         software_mention = ""
         return (equipment_category, software_mention)
@@ -717,7 +867,7 @@ def get_subject_line(icp_match: str, pain_theme: str, industry: str, seed: str,
     """
     Get a deterministic subject line variation based on ICP and pain theme.
     """
-    industry_text = normalize_text(industry) or "operations"
+    industry_text = industry_display_text(industry)
     subject_templates = get_subject_templates_for_strategy(strategy)
     theme_templates = subject_templates.get(pain_theme, [])
     icp_templates = SUBJECT_TEMPLATES_BY_ICP.get(icp_match, [])
@@ -765,7 +915,20 @@ def fill_template(template: str, data: dict) -> str:
     return result
 
 
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """normalize_text() applied to a column, or empty strings if the column is missing."""
+    if name in df.columns:
+        return df[name].map(normalize_text).astype(object)
+    return pd.Series([""] * len(df), index=df.index, dtype=object)
+
+
 def prepare_personalization_controls(df: pd.DataFrame, strategy: str = "conventional") -> pd.DataFrame:
+    """
+    Add the deterministic personalization columns (role level, pain theme, ...) to df.
+
+    Text columns are normalized once up front; keyword matching for each
+    distinct title and equipment/notes text is cached in keyword_hits.
+    """
     role_levels = []
     icp_confidences = []
     certainty_levels = []
@@ -776,19 +939,23 @@ def prepare_personalization_controls(df: pd.DataFrame, strategy: str = "conventi
     strategy_email_1 = []
     strategy_email_2 = []
 
-    for _, row in df.iterrows():
-        job_title = normalize_text(row.get("Job title", ""))
-        industry = normalize_text(row.get("Industry", ""))
-        icp_match = normalize_text(row.get("ICP Match", ""))
-        notes = normalize_text(row.get("Notes", ""))
-        equipment = normalize_text(row.get("Equipment", ""))
+    columns = zip(
+        df.to_dict("records"),
+        _text_column(df, "Job title"),
+        _text_column(df, "Industry"),
+        _text_column(df, "ICP Match"),
+        _text_column(df, "Equipment"),
+        _text_column(df, "Notes")
+    )
+    for record, job_title, industry, icp_match, equipment, notes in columns:
+        ctx = LeadContext.from_fields(job_title, industry, equipment, notes)
 
-        role_level = classify_role_level(job_title)
-        anchors = extract_equipment_anchors(equipment, notes)
-        pain_theme = infer_pain_theme(icp_match, role_level, equipment, notes)
-        assignment, email_1_strategy, email_2_strategy = resolve_email_strategies(row, strategy)
+        role_level = classify_role_level(ctx)
+        anchors = extract_equipment_anchors(ctx)
+        pain_theme = infer_pain_theme(ctx, icp_match, role_level)
+        assignment, email_1_strategy, email_2_strategy = resolve_email_strategies(record, strategy)
         pain_statement = select_pain_statement(icp_match, role_level, pain_theme, email_1_strategy)
-        icp_confidence = compute_icp_confidence(icp_match, industry, role_level, anchors)
+        icp_confidence = compute_icp_confidence(icp_match, ctx, role_level, anchors)
         certainty_level = confidence_to_certainty(icp_confidence)
 
         role_levels.append(role_level)
@@ -944,7 +1111,8 @@ def generate_campaigns(input_path: str, output_path: str, limit: int = None, rai
         )
 
         # Get equipment offer based on ICP + equipment context
-        equipment_category, software_mention = get_equipment_offer(icp_match, equipment, icp_notes)
+        ctx = LeadContext.from_fields(job_title, industry, equipment, icp_notes)
+        equipment_category, software_mention = get_equipment_offer(ctx, icp_match)
 
         credibility_variant_id, credibility_anchor = build_credibility_anchor(
             equipment_category,
@@ -105,7 +105,7 @@ def enroll_lead_in_sequence(person_key, campaign_id, sequence_id):
         next_action_at = now
 
     with get_connection() as conn:
-        conn.execute("""
+        cursor = conn.execute("""
             INSERT INTO outreach_log (person_key, campaign_id, sequence_step, sent_at, status, channel, next_action_at, action_metadata)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
@@ -119,8 +119,7 @@ def enroll_lead_in_sequence(person_key, campaign_id, sequence_id):
             json.dumps(first_step)
         ))
 
-        row = conn.execute("SELECT last_insert_rowid() as id").fetchone()
-        return row['id']
+        return cursor.lastrowid
 
 
 def process_sequences():
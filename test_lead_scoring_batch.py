@@ -0,0 +1,68 @@
+"""
+Parity tests for lead_scoring_batch.score_icp_batch.
+
+score_icp_batch must agree with extract_features + score_icp +
+compute_automation_readiness, which score one lead at a time.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from lead_scoring import compute_automation_readiness, extract_features, score_icp
+from lead_scoring_batch import score_icp_batch
+
+# Relative to today so tenure stays on the same side of the 3-year cutoff
+RECENT_START = (datetime.now(timezone.utc) - timedelta(days=200)).isoformat()
+OLD_START = "2010-01-01T00:00:00Z"
+
+PEOPLE = [
+    {"title": "Director of Operations", "job_start_date": RECENT_START},
+    {"title": "Quality Assurance Manager", "job_start_date": OLD_START},
+    {"title": "Plant Manager", "job_start_date": None},
+    {"title": "VP Ecommerce Fulfillment", "job_start_date": RECENT_START},
+    {"title": "Controls Engineer", "job_start_date": "not a date"},
+    {"title": None},
+]
+
+COMPANIES = [
+    {"industry": "Third Party Logistics", "employee_count": 350, "technologies": ["Manhattan WMS", "SAP"],
+     "job_postings_relevant": 1, "locations": ["TX"]},
+    {"industry": "Frozen Food Distribution", "employee_count": "300", "technologies": "Excel, Outlook",
+     "locations": None},
+    {"industry": "Industrial Manufacturing", "employee_count": 1200, "technologies": ["NetSuite ERP"],
+     "equipment_signals": ["conveyor"]},
+    {"industry": "E-commerce Retail", "employee_count": 900, "technologies": ["Blue Yonder WMS"] * 9,
+     "job_postings_relevant": 6, "locations": ["CA", "NV", "OH"], "controls_roles_hiring": True,
+     "equipment_signals": ["asrs"]},
+    {"industry": None, "employee_count": None, "controls_roles_hiring": True,
+     "equipment_signals": ["automation", "sortation"]},
+    {},
+]
+
+
+def test_score_icp_batch_matches_per_lead_scoring():
+    icp_match, icp_score, readiness = score_icp_batch(pd.DataFrame(PEOPLE), pd.DataFrame(COMPANIES))
+
+    expected = []
+    for person, company in zip(PEOPLE, COMPANIES):
+        features = extract_features(person, company)
+        best_icp, best_score, _ = score_icp(features)
+        expected.append((best_icp, best_score, compute_automation_readiness(features)))
+
+    actual = list(zip(icp_match.tolist(), icp_score.tolist(), readiness.tolist()))
+    assert actual == expected
+
+
+def test_score_icp_batch_fixed_results():
+    icp_match, icp_score, readiness = score_icp_batch(pd.DataFrame(PEOPLE), pd.DataFrame(COMPANIES))
+
+    assert icp_match.tolist() == ["ICP 1", "ICP 2", "ICP 3", "ICP 4", "ICP 5", "ICP 2"]
+    assert icp_score.tolist() == [5, 5, 4, 6, 2, 1]
+    assert readiness.tolist() == [40, 0, 15, 100, 30, 0]
+
+
+def test_score_icp_batch_rejects_misaligned_frames():
+    with pytest.raises(ValueError):
+        score_icp_batch(pd.DataFrame(PEOPLE), pd.DataFrame(COMPANIES[:2]))
@@ -0,0 +1,141 @@
+"""
+Tests for the deterministic personalization columns added by main.prepare_personalization_controls.
+"""
+
+import numpy as np
+import pandas as pd
+
+import main
+from main import prepare_personalization_controls
+
+CONTROL_COLUMNS = [
+    "role_level",
+    "icp_confidence",
+    "certainty_level",
+    "pain_theme",
+    "pain_statement",
+    "equipment_anchor",
+    "strategy_assignment",
+    "strategy_email_1",
+    "strategy_email_2",
+]
+
+LEADS = [
+    {"Job title": "VP of Operations", "Industry": "Third Party Logistics", "ICP Match": "ICP 1",
+     "Equipment": "Pallet Shuttle, conveyor", "Notes": "Labor shortages on second shift"},
+    {"Job title": "Controls Engineer", "Industry": "Other", "ICP Match": "ICP 4",
+     "Equipment": "", "Notes": "Looking at a new WMS", "strategy_assignment": "hybrid"},
+    {"Job title": None, "Industry": None, "ICP Match": "ICP 9",
+     "Equipment": np.nan, "Notes": np.nan, "strategy_assignment": "semi_auto"},
+    {"Job title": "Warehouse Manager", "Industry": "Frozen Foods", "ICP Match": "ICP 2",
+     "Equipment": "Selective racking", "Notes": "", "strategy_assignment": "bogus"},
+]
+
+EXPECTED = [
+    {
+        "role_level": "vp_director",
+        "icp_confidence": "high",
+        "certainty_level": "strong",
+        "pain_theme": "space",
+        "pain_statement": "Pick paths and racking layouts often need re-slotting as SKU velocity changes.",
+        "equipment_anchor": "conveyor, pallet_shuttle, asrs",
+        "strategy_assignment": "conventional",
+        "strategy_email_1": "conventional",
+        "strategy_email_2": "conventional",
+    },
+    {
+        "role_level": "engineer",
+        "icp_confidence": "low",
+        "certainty_level": "light",
+        "pain_theme": "integration",
+        "pain_statement": "Controls and WMS coordination tends to lag equipment deployment in phased projects.",
+        "equipment_anchor": "wms",
+        "strategy_assignment": "hybrid",
+        "strategy_email_1": "semi_auto",
+        "strategy_email_2": "full_auto",
+    },
+    {
+        "role_level": "unknown",
+        "icp_confidence": "low",
+        "certainty_level": "light",
+        "pain_theme": "throughput",
+        "pain_statement": "Dense storage and access tradeoffs usually surface before automation plans are stable.",
+        "equipment_anchor": "",
+        "strategy_assignment": "semi_auto",
+        "strategy_email_1": "semi_auto",
+        "strategy_email_2": "semi_auto",
+    },
+    {
+        "role_level": "manager",
+        "icp_confidence": "medium",
+        "certainty_level": "moderate",
+        "pain_theme": "reconfiguration",
+        "pain_statement": "Throughput often tightens where storage and picking exchange materials.",
+        "equipment_anchor": "racking",
+        "strategy_assignment": "conventional",
+        "strategy_email_1": "conventional",
+        "strategy_email_2": "conventional",
+    },
+]
+
+
+def test_prepare_personalization_controls_fixed_rows():
+    df = prepare_personalization_controls(pd.DataFrame(LEADS), "conventional")
+
+    assert df[CONTROL_COLUMNS].to_dict("records") == EXPECTED
+
+
+def test_keyword_hits_automaton_matches_regex_fallback(monkeypatch):
+    texts = [
+        "vp of operations",
+        "pallet shuttles, push-back rack and a vertical lift module",
+        "manual re-slotting after the wms integration",
+        "head of sortation and shipping dock",
+        "",
+    ]
+    main.keyword_hits.cache_clear()
+    with_automaton = [main.keyword_hits(text) for text in texts]
+
+    monkeypatch.setattr(main, "KEYWORD_AUTOMATON", None)
+    main.keyword_hits.cache_clear()
+    try:
+        with_regexes = [main.keyword_hits(text) for text in texts]
+    finally:
+        main.keyword_hits.cache_clear()
+
+    assert with_automaton == with_regexes
+    assert ("role", "vp_director") in with_automaton[0]
+    assert {("equipment", "pallet_shuttle"), ("equipment", "asrs"), ("equipment", "racking"),
+            ("equipment", "vlm"), ("pain", "space")} <= with_automaton[1]
+    assert with_automaton[4] == frozenset()
+
+
+def test_prepare_personalization_controls_without_automaton(monkeypatch):
+    # keyword_hits falls back to the KEYWORD_PATTERNS regexes when pyahocorasick is missing
+    monkeypatch.setattr(main, "KEYWORD_AUTOMATON", None)
+    main.keyword_hits.cache_clear()
+    try:
+        df = prepare_personalization_controls(pd.DataFrame(LEADS), "conventional")
+    finally:
+        main.keyword_hits.cache_clear()
+
+    assert df[CONTROL_COLUMNS].to_dict("records") == EXPECTED
+
+
+def test_prepare_personalization_controls_missing_columns():
+    df = prepare_personalization_controls(pd.DataFrame({"Job title": ["Chief Operating Officer"]}), "full_auto")
+
+    row = df[CONTROL_COLUMNS].to_dict("records")[0]
+    assert row["role_level"] == "c_suite"
+    assert row["equipment_anchor"] == ""
+    assert row["icp_confidence"] == "low"
+    assert (row["strategy_assignment"], row["strategy_email_1"], row["strategy_email_2"]) == (
+        "full_auto", "full_auto", "full_auto"
+    )
+
+
+def test_prepare_personalization_controls_empty_frame():
+    df = prepare_personalization_controls(pd.DataFrame(columns=["Job title", "ICP Match"]))
+
+    assert len(df) == 0
+    assert set(CONTROL_COLUMNS) <= set(df.columns)
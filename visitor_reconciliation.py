@@ -413,7 +413,7 @@ def get_visitor_company_detail(company_key: str) -> dict:
                     SELECT p.*, c.name as company_name
                     FROM leads_people p
                     LEFT JOIN leads_company c ON p.company_key = c.company_key
-                    WHERE c.domain_norm = ?
+                    WHERE c.domain_norm = ? COLLATE NOCASE
                     LIMIT 20
                 """, (normalize_domain(domain),)).fetchall()
                 company["contacts"] = [dict(p) for p in people]